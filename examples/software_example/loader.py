@@ -51,16 +51,11 @@ async def load_clients(dir_path: Path) -> list[TelegramClient]:
 
     await process_lone_files(files)
 
-    for session_name, item in files.items():
-        try:
-            client = TelegramClient(
-                item.session,
-                json_attachment=await JsonAttachment(item.json).load(),
-                connection_retries=CONNECTION_RETRIES,
-            )
-            clients.append(client)
-            logger.info(f"Client loaded: {session_name}")
-        except Exception as exc:
-            logger.error(f"Error loading {session_name}: {exc}")
+    def on_error(item: helpers.files.SessionItem, exc: Exception) -> None:
+        logger.error(f"Error loading {item.session}: {exc}")
+
+    async for client in TelegramClient.load_many(dir_path, on_error=on_error, connection_retries=CONNECTION_RETRIES):
+        clients.append(client)
+        logger.info(f"Client loaded: {client.memory.session_file}")
 
     return clients
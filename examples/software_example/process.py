@@ -1,5 +1,4 @@
 import asyncio
-from typing import Optional
 from wtelethon import TelegramClient, storages, utils
 from config import DEAD_DIR_PATH, SLEEP_INTERVAL
 from logging_config import get_logger
@@ -24,8 +23,9 @@ async def process_client(client: TelegramClient) -> None:
 
 
 async def _process_iteration() -> None:
-    client: Optional[TelegramClient] = storages.client_holds_storage.get_free_client()
-    if client is None:
+    try:
+        client: TelegramClient = await storages.client_holds_storage.wait_free_client(timeout=SLEEP_INTERVAL)
+    except asyncio.TimeoutError:
         logger.warning("No free accounts available")
         return
 
@@ -63,7 +63,6 @@ async def run_software() -> None:
     try:
         while storages.client_holds_storage._holds:
             await _process_iteration()
-            await asyncio.sleep(SLEEP_INTERVAL)
     except KeyboardInterrupt:
         logger.info("Stopping program...")
         logger.info("Program stopped. Thank you!")
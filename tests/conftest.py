@@ -0,0 +1,11 @@
+import pytest
+
+from wtelethon.storages.proxies import ProxyStorage
+
+
+@pytest.fixture
+def storage():
+    """Отдельное хранилище прокси для теста (в обход singleton)."""
+    storage = type.__call__(ProxyStorage)
+    yield storage
+    storage.detach_shared_state()
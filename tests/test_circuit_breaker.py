@@ -0,0 +1,45 @@
+import asyncio
+import contextlib
+import time
+
+import pytest
+from telethon.sessions import StringSession
+
+from wtelethon import MemoryAttachment, TelegramClient, proxy_storage
+from wtelethon.storages.circuit_breaker import CircuitState
+
+
+SOURCE = "socks5://10.5.0.1:1080"
+
+
+@pytest.fixture
+def proxy():
+    proxy_storage.add_proxy(SOURCE, None)
+    yield proxy_storage.get_proxy_by_source(SOURCE)
+    proxy_storage.remove_proxy(SOURCE)
+
+
+def test_failed_connect_reopens_half_open_breaker(proxy):
+    async def main():
+        client = TelegramClient(
+            StringSession(),
+            memory_attachment=MemoryAttachment(api_id=1, api_hash="x", phone="+79991234567"),
+        )
+        assert client.set_proxy_from_storage() is proxy
+
+        async def failing(connection):
+            raise ConnectionError("proxy down")
+
+        client._sender.connect = failing
+        # время размыкания истекло: это подключение - пробное
+        proxy.breaker.trip(time.time() - 10_000)
+        assert proxy.breaker.available_at(time.time()) == 0
+        assert proxy.breaker.state is CircuitState.HALF_OPEN
+
+        with contextlib.suppress(ConnectionError):
+            await client.connect()
+
+    asyncio.run(main())
+
+    assert proxy.breaker.state is CircuitState.OPEN
+    assert not proxy_storage.is_available(proxy)
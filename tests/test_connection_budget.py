@@ -0,0 +1,41 @@
+import asyncio
+
+import pytest
+
+from wtelethon.storages.connections import ConnectionBudgetStorage
+
+
+class _Client:
+    """Клиент, у которого connect() глотает ошибку, как TelegramClient с handle_exception."""
+
+    def __init__(self):
+        self.connected = False
+        self.reachable = False
+
+    def is_connected(self) -> bool:
+        return self.connected
+
+    async def connect(self) -> None:
+        self.connected = self.reachable
+
+
+def test_failed_reconnect_keeps_client_evicted():
+    budget = type.__call__(ConnectionBudgetStorage)
+    budget.configure(max_connected=1)
+    client = _Client()
+    budget._evicted.add(client)
+
+    async def main():
+        with pytest.raises(ConnectionError):
+            await budget.begin_call(client)
+
+        # клиент не переподключился - следующий запрос снова попробует
+        assert client in budget._evicted
+        assert not budget._in_flight[client]
+
+        client.reachable = True
+        await budget.begin_call(client)
+        budget.end_call(client)
+
+    asyncio.run(main())
+    assert client not in budget._evicted
@@ -0,0 +1,105 @@
+import asyncio
+import gc
+import json
+import os
+import tracemalloc
+
+from telethon.crypto import AuthKey
+from telethon.sessions import SQLiteSession
+
+from wtelethon.storages import DormantClient, dormant_storage
+
+
+ACCOUNTS = 100
+
+
+def _make_account(tmp_path) -> tuple[str, str]:
+    session = SQLiteSession(str(tmp_path / "79990"))
+    session.set_dc(2, "149.154.167.51", 443)
+    session.auth_key = AuthKey(os.urandom(256))
+    session.save()
+    session.close()
+
+    json_path = tmp_path / "79990.json"
+    json_path.write_text(
+        json.dumps(
+            {
+                "app_id": 2040,
+                "app_hash": "b18441a1ff607e10a989891a5462e627",
+                "phone": "79990",
+                "device": "PC",
+                "sdk": "Windows 10",
+                "app_version": "1.0",
+                "lang_code": "en",
+                "system_lang_code": "en-US",
+            }
+        )
+    )
+    return str(tmp_path / "79990.session"), str(json_path)
+
+
+def _traced() -> int:
+    gc.collect()
+    return tracemalloc.get_traced_memory()[0]
+
+
+def test_dormant_memory_benchmark(tmp_path):
+    """Бенчмарк: память описаний в неактивном и материализованном состоянии."""
+    session_path, json_path = _make_account(tmp_path)
+
+    async def main():
+        # прогрев: ленивые импорты и пул потоков не должны попасть в замер
+        warmup = await DormantClient.from_files(session_path, json_path, idle_timeout=60)
+        await warmup.materialize()
+        await warmup.dematerialize()
+
+        tracemalloc.start()
+        try:
+            base = _traced()
+            accounts = [
+                await DormantClient.from_files(session_path, json_path, idle_timeout=60) for _ in range(ACCOUNTS)
+            ]
+            dormant = _traced()
+
+            for account in accounts:
+                await account.materialize()
+
+            materialized = _traced()
+            assert dormant_storage.materialized == ACCOUNTS
+
+            await dormant_storage.dematerialize_all()
+            released = _traced()
+        finally:
+            tracemalloc.stop()
+
+        assert all(account.client is None and account.auth_key for account in accounts)
+        return (dormant - base) / ACCOUNTS, (materialized - dormant) / ACCOUNTS, (released - base) / ACCOUNTS
+
+    dormant, materialized, released = asyncio.run(main())
+    print(
+        f"\nper account: dormant {dormant / 1024:.1f} KB, materialized +{materialized / 1024:.1f} KB, "
+        f"after dematerialize {released / 1024:.1f} KB"
+    )
+
+    assert dormant_storage.materialized == 0
+    assert dormant < 4 * 1024
+    assert materialized > 5 * dormant
+    assert released < 2 * dormant
+
+
+def test_idle_client_is_dematerialized(tmp_path):
+    session_path, json_path = _make_account(tmp_path)
+
+    async def main():
+        account = await DormantClient.from_files(session_path, json_path, idle_timeout=0.1)
+        async with account.use() as client:
+            await asyncio.sleep(0.2)
+            # клиент в работе не закрывается по таймауту
+            assert account.client is client
+
+        await asyncio.sleep(0.3)
+        return account
+
+    account = asyncio.run(main())
+    assert account.client is None
+    assert account.memory.phone == "79990"
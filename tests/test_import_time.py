@@ -0,0 +1,54 @@
+import subprocess
+import sys
+
+import pytest
+
+
+HEAVY_MODULES = ("phonenumbers", "pytz", "loguru")
+
+
+def _import_times(statement: str) -> dict[str, int]:
+    """Запускает импорт в новом интерпретаторе и разбирает вывод `-X importtime`.
+
+    Returns:
+        Накопленное время импорта каждого модуля в микросекундах.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+
+        _, cumulative, module = line.split("|")
+        times[module.strip()] = int(cumulative)
+
+    return times
+
+
+@pytest.mark.parametrize("statement", ["import wtelethon", "from wtelethon import TelegramClient"])
+def test_import_does_not_load_heavy_modules(statement):
+    """Бенчмарк: время импорта пакета и отсутствие тяжёлых модулей."""
+    times = _import_times(statement)
+    slowest = sorted(times.items(), key=lambda item: item[1], reverse=True)[:5]
+    print(f"\n{statement}: {times['wtelethon'] / 1000:.0f} ms")
+    for module, cumulative in slowest:
+        print(f"  {cumulative / 1000:8.1f} ms  {module}")
+
+    assert not [module for module in times if module.split(".")[0] in HEAVY_MODULES]
+
+
+def test_lazy_attributes_still_resolve():
+    # модули, загруженные через importlib.import_module, не попадают в вывод -X importtime
+    statement = (
+        "import sys, wtelethon; "
+        "assert wtelethon.utils is sys.modules['wtelethon.lib.utils']; "
+        "assert wtelethon.helpers.storages.proxies is sys.modules['wtelethon.lib.helpers.storages.proxies']"
+    )
+
+    assert "loguru" in _import_times(statement)
@@ -0,0 +1,117 @@
+import asyncio
+import contextlib
+import socket
+
+from wtelethon.lib.helpers.storages import health
+from wtelethon.lib.helpers.storages.health import check_proxies
+
+
+# стенды принимают туннель, но никуда не подключаются: цель проверки не важна
+TARGET = ("127.0.0.1", 443)
+
+
+async def _socks5_handler(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    # минимальный SOCKS5 без авторизации: приветствие, CONNECT, успех
+    _, methods = await reader.readexactly(2)
+    await reader.readexactly(methods)
+    writer.write(b"\x05\x00")
+
+    _, _, _, address_type = await reader.readexactly(4)
+    if address_type == 3:
+        address_length = (await reader.readexactly(1))[0]
+    else:
+        address_length = 16 if address_type == 4 else 4
+
+    await reader.readexactly(address_length + 2)
+    writer.write(b"\x05\x00\x00\x01" + bytes(6))
+    await writer.drain()
+    await reader.read()
+    writer.close()
+
+
+async def _http_handler(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    await reader.readuntil(b"\r\n\r\n")
+    writer.write(b"HTTP/1.1 200 Connection established\r\n\r\n")
+    await writer.drain()
+    await reader.read()
+    writer.close()
+
+
+async def _silent_handler(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    await reader.read()
+    writer.close()
+
+
+def _port(server: asyncio.AbstractServer) -> int:
+    return server.sockets[0].getsockname()[1]
+
+
+def _closed_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def test_check_proxies_against_local_stand_in(storage):
+    async def main():
+        async with contextlib.AsyncExitStack() as stack:
+            socks = await asyncio.start_server(_socks5_handler, "127.0.0.1", 0)
+            http = await asyncio.start_server(_http_handler, "127.0.0.1", 0)
+            silent = await asyncio.start_server(_silent_handler, "127.0.0.1", 0)
+            for server in (socks, http, silent):
+                await stack.enter_async_context(server)
+
+            storage.add_proxy(f"127.0.0.1:{_port(socks)}", "socks5")
+            storage.add_proxy(f"127.0.0.1:{_port(http)}", "http")
+            # порт закрыт, а второй прокси принимает соединение, но не отвечает
+            storage.add_proxy(f"127.0.0.1:{_closed_port()}", "socks5")
+            storage.add_proxy(f"127.0.0.1:{_port(silent)}", "http")
+
+            return await check_proxies(
+                storage.get_proxies(), concurrency=2, timeout=0.5, target=TARGET, dead_time=60
+            )
+
+    report = asyncio.run(main())
+
+    assert report.checked == 4
+    assert not report.skipped
+    assert sorted(proxy.network_type for proxy in report.alive) == ["HTTP", "SOCKS5"]
+    assert all(proxy.latency is not None and proxy.latency < 0.5 for proxy in report.alive)
+
+    # нерабочие прокси больше не выдаются
+    picked = {storage.get_proxy().source for _ in range(10)}
+    assert picked == {proxy.source for proxy in report.alive}
+
+
+def test_time_budget_skips_unchecked_proxies(storage):
+    async def main():
+        async with contextlib.AsyncExitStack() as stack:
+            for _ in range(5):
+                silent = await asyncio.start_server(_silent_handler, "127.0.0.1", 0)
+                await stack.enter_async_context(silent)
+                storage.add_proxy(f"127.0.0.1:{_port(silent)}", "http")
+
+            return await check_proxies(
+                storage.get_proxies(), concurrency=2, timeout=5, time_budget=0.2, target=TARGET
+            )
+
+    report = asyncio.run(main())
+
+    assert report.elapsed < 1
+    assert report.checked + len(report.skipped) == 5
+    assert len(report.skipped) >= 3
+
+
+def test_unexpected_connector_error_marks_proxy_dead(storage, monkeypatch):
+    def broken_connector(*args, **kwargs):
+        raise RuntimeError("unsupported proxy")
+
+    monkeypatch.setattr(health, "AsyncProxy", broken_connector)
+    storage.add_proxy("127.0.0.1:1", "socks5")
+    storage.add_proxy("127.0.0.1:2", "http")
+
+    report = asyncio.run(check_proxies(storage.get_proxies(), concurrency=1, timeout=0.5, target=TARGET))
+
+    # воркер не падает: обе проверки учтены как неудачные
+    assert len(report.dead) == 2
+    assert not report.alive and not report.skipped
@@ -0,0 +1,139 @@
+import asyncio
+import collections
+import random
+import threading
+import time
+
+import pytest
+
+from wtelethon.storages.circuit_breaker import CircuitState
+from wtelethon.storages.proxies import ProxyStorage
+
+
+PROXIES = 3
+MAX_PER_PROXY = 2
+TASKS = 300
+
+
+def _add_proxies(storage: ProxyStorage):
+    for index in range(PROXIES):
+        storage.add_proxy(f"10.3.0.{index}:1080", "socks5")
+
+
+def test_leases_never_exceed_limit_under_load(storage):
+    """Стресс: сотни корутин арендуют прокси, пока потоки меняют хранилище."""
+    _add_proxies(storage)
+    active = collections.Counter()
+    peak = collections.Counter()
+    stop = threading.Event()
+    errors = []
+
+    def churn(worker: int):
+        # потоки добавляют и удаляют свои прокси и выбирают прокси мимо аренды
+        try:
+            while not stop.is_set():
+                source = f"10.4.{worker}.{random.randrange(20)}:1080"
+                if storage.get_proxy_by_source(source) is None:
+                    storage.add_proxy(source, "socks5", tags={"pool": "churn"})
+                else:
+                    storage.remove_proxy(source)
+
+                storage.get_proxy(tags={"pool": "churn"})
+        except Exception as exc:
+            errors.append(exc)
+
+    async def user():
+        async with storage.lease(max_per_proxy=MAX_PER_PROXY, tags={"pool": "stress"}) as proxy:
+            active[proxy.source] += 1
+            peak[proxy.source] = max(peak[proxy.source], active[proxy.source])
+            await asyncio.sleep(random.random() * 0.002)
+            active[proxy.source] -= 1
+
+    async def main():
+        await asyncio.wait_for(asyncio.gather(*(user() for _ in range(TASKS))), timeout=60)
+
+    for proxy in storage.get_proxies():
+        storage.set_proxy_tags(proxy.source, {"pool": "stress"})
+
+    threads = [threading.Thread(target=churn, args=(worker,)) for worker in range(4)]
+    for thread in threads:
+        thread.start()
+
+    try:
+        asyncio.run(main())
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+    assert not errors
+    # все ожидающие дождались аренды, лимит ни разу не превышен
+    assert sum(active.values()) == 0
+    assert set(peak) <= {f"socks5://10.3.0.{index}:1080" for index in range(PROXIES)}
+    assert max(peak.values()) <= MAX_PER_PROXY
+    assert all(proxy.leases == 0 for proxy in storage.get_proxies())
+
+
+def test_waiters_are_served_in_order(storage):
+    storage.add_proxy("10.3.1.1:1080", "socks5")
+    order = []
+
+    async def user(index: int):
+        async with storage.lease(max_per_proxy=1):
+            order.append(index)
+            await asyncio.sleep(0)
+
+    async def main():
+        tasks = []
+        for index in range(50):
+            tasks.append(asyncio.create_task(user(index)))
+            # задачи встают в очередь в порядке создания
+            await asyncio.sleep(0)
+
+        await asyncio.gather(*tasks)
+
+    asyncio.run(main())
+    assert order == list(range(50))
+
+
+def test_cancelled_waiter_does_not_lose_wakeup(storage):
+    storage.add_proxy("10.3.2.1:1080", "socks5")
+
+    async def main():
+        holder = storage.lease(max_per_proxy=1)
+        await holder.acquire()
+
+        cancelled = asyncio.create_task(storage.lease(max_per_proxy=1).acquire())
+        waiting = asyncio.create_task(storage.lease(max_per_proxy=1).acquire())
+        await asyncio.sleep(0.01)
+
+        # сигнал освобождения уходит первому ожидающему, который тут же отменяется
+        holder.release()
+        cancelled.cancel()
+
+        proxy = await asyncio.wait_for(waiting, timeout=1)
+        assert proxy.source == "socks5://10.3.2.1:1080"
+
+    asyncio.run(main())
+
+
+def test_readding_proxy_keeps_leases_and_breaker(storage):
+    storage.add_proxy("10.3.3.1:1080", "socks5")
+    proxy = storage.get_proxy_by_source("10.3.3.1:1080")
+
+    async def main():
+        async with storage.lease(max_per_proxy=1):
+            storage.add_proxy("10.3.3.1:1080", "socks5", tags={"country": "DE"})
+            # повторное добавление не сбрасывает аренду: второй арендатор ждёт
+            with pytest.raises(asyncio.TimeoutError):
+                await storage.lease(max_per_proxy=1, timeout=0.05).acquire()
+
+    asyncio.run(main())
+
+    assert storage.get_proxy_by_source("10.3.3.1:1080") is proxy
+    assert storage.get_proxy(tags={"country": "DE"}) is proxy
+
+    proxy.breaker.trip(time.time())
+    storage.add_proxy("socks5://10.3.3.1:1080", None)
+    assert proxy.breaker.state is CircuitState.OPEN
+    assert proxy.tags["country"] == "DE"
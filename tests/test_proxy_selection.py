@@ -0,0 +1,56 @@
+import time
+
+import pytest
+
+from wtelethon.storages.proxies import Proxy
+
+
+CALLS = 200
+
+
+def _fill(storage, size: int):
+    storage.add_proxies(
+        Proxy.from_string(f"10.{index // 65536}.{index // 256 % 256}.{index % 256}:1080", "socks5")
+        for index in range(size)
+    )
+
+
+def _sorted_pick(storage) -> Proxy:
+    # прежний выбор: обход всех прокси и сортировка по последнему использованию
+    now = time.time()
+    available = [proxy for proxy in storage.get_proxies() if proxy.available_at() <= now]
+    proxy = next(iter(sorted(available, key=lambda proxy: proxy.last_used)))
+    proxy.usage_update()
+    return proxy
+
+
+def _per_call(pick, calls: int) -> float:
+    started = time.perf_counter()
+    for _ in range(calls):
+        pick()
+
+    return (time.perf_counter() - started) / calls
+
+
+def test_least_used_proxies_go_round(storage):
+    _fill(storage, 100)
+
+    first = [storage.get_proxy().source for _ in range(100)]
+    second = [storage.get_proxy().source for _ in range(100)]
+
+    assert len(set(first)) == 100
+    assert second == first
+
+
+@pytest.mark.parametrize("size", [1_000, 10_000, 100_000])
+def test_heap_selection_benchmark(storage, size):
+    """Бенчмарк: выбор из кучи против прежней сортировки всех прокси."""
+    _fill(storage, size)
+
+    heap = _per_call(storage.get_proxy, CALLS)
+    old = _per_call(lambda: _sorted_pick(storage), max(CALLS * 1_000 // size, 3))
+    print(f"\n{size} proxies: heap {heap * 1e6:.1f} us, sort {old * 1e6:.1f} us per call")
+
+    # выбор из кучи не зависит от размера пула линейно
+    assert heap < old
+    assert heap < 0.001
@@ -0,0 +1,29 @@
+import asyncio
+
+from wtelethon.lib.helpers.storages.proxies import ProxySourceSync
+from wtelethon.storages import proxy_storage
+
+
+def test_sync_retires_only_its_own_proxies(tmp_path):
+    path = tmp_path / "proxies.txt"
+    path.write_text("10.2.0.1:1080\n10.2.0.2:1080\n")
+
+    # прокси добавлен вручную до синхронизации и ещё один - после
+    proxy_storage.add_proxy("10.2.0.2:1080", "socks5")
+    source_sync = ProxySourceSync(str(path), "socks5")
+    try:
+        report = asyncio.run(source_sync.sync())
+        assert report.added == 1
+
+        proxy_storage.add_proxy("10.2.0.3:1080", "socks5")
+        path.write_text("# пусто\n")
+        report = asyncio.run(source_sync.sync())
+
+        assert report.removed == 1
+        assert proxy_storage.get_proxy_by_source("10.2.0.1:1080") is None
+        assert proxy_storage.get_proxy_by_source("10.2.0.2:1080") is not None
+        assert proxy_storage.get_proxy_by_source("10.2.0.3:1080") is not None
+    finally:
+        for source in ("10.2.0.1:1080", "10.2.0.2:1080", "10.2.0.3:1080"):
+            if proxy_storage.get_proxy_by_source(source) is not None:
+                proxy_storage.remove_proxy(source)
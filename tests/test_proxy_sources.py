@@ -0,0 +1,73 @@
+import asyncio
+
+import pytest
+
+from wtelethon.lib.helpers.storages.proxies import load_proxies_from_file
+from wtelethon.storages.proxies import Proxy
+
+
+def test_same_proxy_in_any_format_is_stored_once(storage):
+    storage.add_proxy("1.2.3.4:1080", "socks5")
+    storage.add_proxy("socks5://1.2.3.4:1080", None)
+    storage.add_proxy("5.6.7.8:1080:user:pw", "socks5")
+    storage.add_proxy("user:pw@5.6.7.8:1080", "socks5")
+
+    assert sorted(proxy.source for proxy in storage.get_proxies()) == [
+        "socks5://1.2.3.4:1080",
+        "socks5://user:pw@5.6.7.8:1080",
+    ]
+
+
+def test_lookup_and_remove_by_any_format(storage):
+    storage.add_proxy("user:pw@5.6.7.8:1080", "socks5")
+
+    assert storage.get_proxy_by_source("5.6.7.8:1080:user:pw").source == "socks5://user:pw@5.6.7.8:1080"
+    assert storage.get_proxy_by_source("9.9.9.9:1080") is None
+    assert storage.get_proxy_by_source("not a proxy") is None
+
+    storage.remove_proxy("5.6.7.8:1080:user:pw")
+    assert not storage.get_proxies()
+
+    with pytest.raises(ValueError):
+        storage.remove_proxy("5.6.7.8:1080:user:pw")
+
+
+def test_string_without_scheme_matching_both_types(storage):
+    storage.add_proxy("1.2.3.4:1080", "socks5")
+    storage.add_proxy("1.2.3.4:1080", "http")
+
+    with pytest.raises(ValueError):
+        storage.get_proxy_by_source("1.2.3.4:1080")
+
+    storage.remove_proxy("1.2.3.4:1080", "socks5")
+    assert storage.get_proxy_by_source("1.2.3.4:1080").source == "http://1.2.3.4:1080"
+
+
+def test_remove_file_loaded_proxy(tmp_path):
+    from wtelethon.storages import proxy_storage
+
+    path = tmp_path / "proxies.txt"
+    path.write_text("10.1.1.1:1080\n")
+    asyncio.run(load_proxies_from_file(str(path), "socks5"))
+
+    try:
+        proxy_storage.add_proxy("10.1.1.1:1080", "socks5")
+        assert [proxy.source for proxy in proxy_storage.get_proxies()].count("socks5://10.1.1.1:1080") == 1
+    finally:
+        proxy_storage.remove_proxy("10.1.1.1:1080")
+
+    assert proxy_storage.get_proxy_by_source("10.1.1.1:1080") is None
+
+
+def test_restreaming_proxies_keeps_their_state(storage):
+    storage.add_proxies([Proxy.from_string("1.2.3.4:1080", "socks5")])
+    proxy = storage.get_proxy_by_source("1.2.3.4:1080")
+    proxy.record_connect(0.05)
+    score = proxy.score
+
+    assert storage.add_proxies([Proxy.from_string("1.2.3.4:1080", "socks5")]) == 0
+    assert storage.add_proxies([Proxy.from_string("1.2.3.4:1080", "socks5", tags={"tier": "a"})], replace=True) == 0
+
+    assert storage.get_proxy_by_source("1.2.3.4:1080") is proxy
+    assert proxy.score == score
+    assert storage.get_proxy(tags={"tier": "a"}) is proxy
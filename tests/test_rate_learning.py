@@ -0,0 +1,20 @@
+import pytest
+
+from wtelethon.storages.rate_pacer import MethodPace
+from wtelethon.tools.storages.rate_limit_tools import RateLearningParams, _flood_rate
+
+
+PARAMS = RateLearningParams(min_rate=0.05, max_rate=60, increase=1, decrease=0.5, burst=1, age_bucket="old")
+
+
+@pytest.mark.parametrize(
+    "rate, seconds, expected",
+    [
+        (10, None, 5),  # без времени ожидания - обычное мультипликативное снижение
+        (10, 3, 5),  # короткий FloodWait: 20 запросов в минуту не ограничивают
+        (10, 120, 0.5),  # не больше одного запроса за время ожидания
+        (10, 3600, 0.05),  # не ниже min_rate
+    ],
+)
+def test_flood_wait_seconds_cap_the_rate(rate, seconds, expected):
+    assert _flood_rate(MethodPace(rate), PARAMS, seconds) == pytest.approx(expected)
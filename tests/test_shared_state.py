@@ -0,0 +1,133 @@
+import asyncio
+import collections
+import multiprocessing
+import sqlite3
+import time
+
+from wtelethon.storages.proxies import ProxyStorage
+
+
+PROXIES = 20
+WORKERS = 8
+ITERATIONS = 300
+
+
+def _add_proxies(storage):
+    for index in range(PROXIES):
+        storage.add_proxy(f"10.0.0.{index}:1080", "socks5")
+
+
+def _bench_worker(path, queue):
+    storage = ProxyStorage()
+    _add_proxies(storage)
+    storage.attach_shared_state(path)
+
+    async def main():
+        lag, running = 0.0, True
+
+        async def monitor():
+            nonlocal lag
+            while running:
+                started = time.perf_counter()
+                await asyncio.sleep(0.001)
+                lag = max(lag, time.perf_counter() - started - 0.001)
+
+        monitor_task = asyncio.create_task(monitor())
+        sources, started = [], time.perf_counter()
+        for _ in range(ITERATIONS):
+            sources.append(storage.get_proxy().source)
+            async with storage.lease(max_per_proxy=WORKERS) as leased:
+                sources.append(leased.source)
+                await asyncio.sleep(0)
+
+        elapsed = time.perf_counter() - started
+        running = False
+        await monitor_task
+        return sources, elapsed, lag
+
+    queue.put(asyncio.run(main()))
+    storage.detach_shared_state()
+
+
+def test_eight_processes_share_usage_order(tmp_path):
+    """Бенчмарк: 8 процессов выдают прокси из одного общего состояния."""
+    path = str(tmp_path / "shared.sqlite")
+    context = multiprocessing.get_context("spawn")
+    queue = context.Queue()
+    workers = [context.Process(target=_bench_worker, args=(path, queue)) for _ in range(WORKERS)]
+    for worker in workers:
+        worker.start()
+
+    results = [queue.get(timeout=120) for _ in workers]
+    for worker in workers:
+        worker.join(timeout=30)
+        assert worker.exitcode == 0
+
+    counts = collections.Counter(source for sources, _, _ in results for source in sources)
+    expected = 2 * WORKERS * ITERATIONS / PROXIES
+    elapsed = max(elapsed for _, elapsed, _ in results)
+    lag = max(lag for _, _, lag in results)
+    print(
+        f"\n{WORKERS} processes: {2 * WORKERS * ITERATIONS / elapsed:.0f} acquires/s, "
+        f"max event loop lag {lag * 1000:.1f} ms, per proxy {min(counts.values())}..{max(counts.values())}"
+    )
+
+    # процессы видят использование друг друга - нагрузка распределена равномерно
+    assert len(counts) == PROXIES
+    assert max(counts.values()) - min(counts.values()) <= expected * 0.25
+    # прежние синхронные записи с таймаутом 5 секунд могли остановить loop на секунды
+    assert lag < 1.0
+
+
+def test_locked_file_does_not_block_acquire(storage, tmp_path):
+    path = str(tmp_path / "shared.sqlite")
+    _add_proxies(storage)
+    shared = storage.attach_shared_state(path)
+
+    # другой процесс надолго захватил запись в файл
+    blocker = sqlite3.connect(path, isolation_level=None)
+    blocker.execute("BEGIN IMMEDIATE")
+    try:
+        started = time.perf_counter()
+        proxy = storage.get_proxy()
+        proxy.add_error()
+        assert time.perf_counter() - started < 0.5
+        assert proxy is not None
+        assert shared.has_pending(proxy.source)
+
+        async def lease():
+            async with storage.lease(max_per_proxy=1, timeout=0.3):
+                pass
+
+        started = time.perf_counter()
+        try:
+            asyncio.run(lease())
+        except asyncio.TimeoutError:
+            pass
+        assert time.perf_counter() - started < 1.0
+    finally:
+        blocker.execute("ROLLBACK")
+        blocker.close()
+
+    shared.flush()
+    assert not shared.has_pending(proxy.source)
+
+    _, rows = shared.pull(0)
+    breakers = {source: breaker for source, _, breaker in rows}
+    assert breakers[proxy.source] != {}
+    assert breakers[proxy.source] == proxy.breaker.export_state()
+
+
+def test_release_is_written_in_background(storage, tmp_path):
+    shared = storage.attach_shared_state(str(tmp_path / "shared.sqlite"))
+    _add_proxies(storage)
+
+    async def main():
+        async with storage.lease(max_per_proxy=1) as proxy:
+            assert shared.leases(proxy.source) == 1
+
+        shared.flush()
+        return proxy
+
+    proxy = asyncio.run(main())
+    assert shared.leases(proxy.source) == 0
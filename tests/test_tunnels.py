@@ -0,0 +1,50 @@
+import asyncio
+import socket
+
+import pytest
+
+from wtelethon.storages import tunnels
+from wtelethon.storages.tunnels import TunnelPool
+
+
+class _Connector:
+    """Подменяет python_socks: «туннель» - один конец socketpair."""
+
+    def __init__(self, peers: list[socket.socket]):
+        self._peers = peers
+
+    async def connect(self, dest_host: str, dest_port: int, timeout: float) -> socket.socket:
+        sock, peer = socket.socketpair()
+        self._peers.append(peer)
+        return sock
+
+
+@pytest.fixture
+def pool(storage, monkeypatch):
+    peers = []
+    monkeypatch.setattr(tunnels.AsyncProxy, "create", lambda *args, **kwargs: _Connector(peers))
+    pool = type.__call__(TunnelPool, storage)
+    yield pool
+    pool.clear()
+    for peer in peers:
+        peer.close()
+
+
+def test_rejected_tunnel_leaves_no_empty_queue(storage, pool):
+    storage.add_proxy("10.6.0.1:1080", "socks5")
+    key = (storage.get_proxy_by_source("10.6.0.1:1080").client_format(), "149.154.167.51", 443)
+
+    async def main():
+        # пул выключен - открытый сокет сразу закрывается
+        await pool._start_open(key)
+        assert key not in pool._tunnels
+
+        pool.configure(size=1)
+        await pool._start_open(key)
+        await pool._start_open(key)
+        assert len(pool._tunnels[key]) == 1
+
+        assert pool.take(*key) is not None
+        pool.clear()
+
+    asyncio.run(main())
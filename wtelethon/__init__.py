@@ -1,3 +1,6 @@
+import importlib
+from typing import TYPE_CHECKING
+
 from wtelethon._version import __version__
 from wtelethon.patches.patch import patched
 
@@ -10,22 +13,58 @@ from telethon import functions as tl_functions
 from telethon import errors as tl_errors
 from telethon import events as tl_events
 
-from wtelethon.lib import models
-from wtelethon.lib import utils
-from wtelethon.lib import helpers
+if TYPE_CHECKING:
+    from wtelethon.lib import models, utils, helpers
+    from wtelethon.attachments import PlatformAttachment, MemoryAttachment, JsonAttachment
+    from wtelethon.client import TelegramClient
+    from wtelethon.storages import (
+        client_holds_storage,
+        proxy_storage,
+        rate_limit_storage,
+        rate_pacer_storage,
+        dormant_storage,
+        DormantClient,
+        connection_budget,
+    )
+
+
+# Остальное импортируется при первом обращении (`wtelethon.utils`,
+# `from wtelethon import TelegramClient`): короткие скрипты и воркеры
+# не платят за phonenumbers, loguru и миксины клиента, пока они не нужны.
+_LAZY_ATTRIBUTES: dict[str, tuple[str, "str | None"]] = {
+    "models": ("wtelethon.lib.models", None),
+    "utils": ("wtelethon.lib.utils", None),
+    "helpers": ("wtelethon.lib.helpers", None),
+    "PlatformAttachment": ("wtelethon.attachments", "PlatformAttachment"),
+    "MemoryAttachment": ("wtelethon.attachments", "MemoryAttachment"),
+    "JsonAttachment": ("wtelethon.attachments", "JsonAttachment"),
+    "TelegramClient": ("wtelethon.client", "TelegramClient"),
+    "client_holds_storage": ("wtelethon.storages", "client_holds_storage"),
+    "proxy_storage": ("wtelethon.storages", "proxy_storage"),
+    "rate_limit_storage": ("wtelethon.storages", "rate_limit_storage"),
+    "rate_pacer_storage": ("wtelethon.storages", "rate_pacer_storage"),
+    "dormant_storage": ("wtelethon.storages", "dormant_storage"),
+    "DormantClient": ("wtelethon.storages", "DormantClient"),
+    "connection_budget": ("wtelethon.storages", "connection_budget"),
+}
+
+
+def __getattr__(name: str):
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    module_name, attribute = _LAZY_ATTRIBUTES[name]
+    value = importlib.import_module(module_name)
+    if attribute is not None:
+        value = getattr(value, attribute)
+
+    globals()[name] = value
+    return value
 
-from wtelethon.attachments import (
-    PlatformAttachment,
-    MemoryAttachment,
-    JsonAttachment,
-)
 
-from wtelethon.client import TelegramClient
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
 
-from wtelethon.storages import (
-    client_holds_storage,
-    proxy_storage,
-)
 
 __all__ = [
     "TelegramClient",
@@ -37,6 +76,11 @@ __all__ = [
     "helpers",
     "client_holds_storage",
     "proxy_storage",
+    "rate_limit_storage",
+    "rate_pacer_storage",
+    "dormant_storage",
+    "DormantClient",
+    "connection_budget",
     "PlatformAttachment",
     "MemoryAttachment",
     "JsonAttachment",
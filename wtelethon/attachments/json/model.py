@@ -174,4 +174,7 @@ class JsonAttachment:
         # --- notification
         memory.push_token = self.first("device_token")
 
+        # --- rate limits
+        memory.learned_rates = self.first("learned_rates")
+
         return True
@@ -85,6 +85,11 @@ class FilesFields:
     session_file: Optional[str] = None
 
 
+class RateLimitFields:
+    # изученные безопасные частоты методов TL: {имя класса запроса: запросов в минуту}
+    learned_rates: Optional[dict[str, float]] = None
+
+
 class PremiumFields:
     premium_status: bool = False
     premium_until_date: Optional[datetime.datetime] = None
@@ -100,6 +105,7 @@ class MemoryAttachment(
     NetworkFields,
     FilesFields,
     PremiumFields,
+    RateLimitFields,
     NotificationFields,
     DeadErrorFields,
 ):
@@ -201,6 +207,8 @@ class MemoryAttachment(
             "premium_expiry": self._to_ts(self.premium_until_date),
             # notification
             "device_token": self.push_token,
+            # ограничения частоты
+            "learned_rates": self.learned_rates or None,
         }
 
         # убрать None
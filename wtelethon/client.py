@@ -31,10 +31,12 @@ from wtelethon.tools.attachments import (
 from wtelethon.tools.storages import (
     ProxyStorageTools,
     ClientHoldStorageTools,
+    RateLimitStorageTools,
 )
 from wtelethon.tools.client.internal_tools import InternalTools
 from wtelethon.tools.handlers.exception_tools import ExceptionHandlerTools
 from wtelethon.tools.session.convert_tools import ConvertTools
+from wtelethon.tools.session.loader_tools import LoaderTools
 
 SessionType = Union[MemorySession, SQLiteSession, StringSession]
 
@@ -53,12 +55,14 @@ class TelegramClient(
     InternalTools,
     ExceptionHandlerTools,
     ConvertTools,
+    LoaderTools,
     MemoryAttachmentTools,
     JsonAttachmentTools,
     FileAttachmentsTools,
     PlatformAttachmentTools,
     ProxyStorageTools,
     ClientHoldStorageTools,
+    RateLimitStorageTools,
     TC,
 ):
     """Телеграм-клиент с расширенными возможностями."""
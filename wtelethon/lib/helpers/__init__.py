@@ -1 +1,13 @@
-from . import files, storages, logging, tasks, tdata
+import importlib
+
+
+# подмодули импортируются при первом обращении: loguru, криптография tdata
+# и прочее не загружаются вместе с клиентом, пока не понадобятся
+__all__ = ["files", "storages", "logging", "tasks", "tdata"]
+
+
+def __getattr__(name: str):
+    if name not in __all__:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    return importlib.import_module(f"{__name__}.{name}")
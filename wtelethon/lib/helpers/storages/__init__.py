@@ -1,3 +1,11 @@
-from . import proxies
+import importlib
 
-__all__ = ["proxies"]
+
+__all__ = ["proxies", "health", "diagnostics"]
+
+
+def __getattr__(name: str):
+    if name not in __all__:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    return importlib.import_module(f"{__name__}.{name}")
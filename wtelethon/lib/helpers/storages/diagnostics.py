@@ -0,0 +1,54 @@
+import gc
+from dataclasses import dataclass
+from typing import Optional
+
+from wtelethon.storages import client_holds_storage, proxy_storage
+
+
+@dataclass
+class LiveClientsReport:
+    """Количество живых клиентов, на которые ссылаются хранилища.
+
+    Attributes:
+        client_holds: Клиенты в `client_holds_storage`.
+        proxy_leases: Активные аренды прокси в `proxy_storage` (по одной на клиента).
+        total: Все живые объекты TelegramClient в процессе, если их подсчёт был запрошен.
+    """
+
+    client_holds: int = 0
+    proxy_leases: int = 0
+    total: Optional[int] = None
+
+    @property
+    def untracked(self) -> Optional[int]:
+        """Живые клиенты, которых нет в хранилище блокировок (кандидаты в утечки)."""
+        return None if self.total is None else self.total - self.client_holds
+
+
+def get_live_clients_report(count_all: bool = False) -> LiveClientsReport:
+    """Собирает отчёт о живых клиентах в хранилищах для поиска утечек памяти.
+
+    Args:
+        count_all: Если True, дополнительно считает все живые TelegramClient
+            через `gc.get_objects()` - это обход всех объектов процесса,
+            поэтому вызывать его стоит редко.
+
+    Returns:
+        Объект LiveClientsReport.
+
+    Example:
+        >>> report = get_live_clients_report(count_all=True)
+        >>> print(f"В хранилище: {report.client_holds}, всего: {report.total}")
+    """
+    report = LiveClientsReport(
+        client_holds=client_holds_storage.live_clients,
+        proxy_leases=sum(proxy.leases for proxy in proxy_storage.get_proxies()),
+    )
+
+    if count_all:
+        # клиент импортирует helpers при загрузке пакета
+        from wtelethon.client import TelegramClient
+
+        report.total = sum(isinstance(obj, TelegramClient) for obj in gc.get_objects())
+
+    return report
@@ -0,0 +1,157 @@
+import asyncio
+import contextlib
+import time
+from dataclasses import dataclass, field
+from typing import Iterable, Optional
+
+import python_socks
+from python_socks.async_.asyncio import Proxy as AsyncProxy
+
+from wtelethon.lib.helpers.tasks import run_fetch_task
+from wtelethon.lib.models import TGDC
+from wtelethon.storages import proxy_storage, Proxy
+
+
+_DEFAULT_TARGET: tuple[str, int] = (TGDC[2][0], 443)
+
+
+@dataclass
+class ProxyHealthReport:
+    """Результат одного прохода проверки прокси."""
+
+    alive: list[Proxy] = field(default_factory=list)
+    dead: list[Proxy] = field(default_factory=list)
+    skipped: list[Proxy] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    @property
+    def checked(self) -> int:
+        return len(self.alive) + len(self.dead)
+
+
+async def check_proxy(
+    proxy: Proxy,
+    target: tuple[str, int] = _DEFAULT_TARGET,
+    timeout: float = 10,
+) -> Optional[float]:
+    """Проверяет прокси, устанавливая через него TCP-соединение до цели.
+
+    Args:
+        proxy: Проверяемый прокси.
+        target: Адрес (host, port), до которого открывается туннель. По умолчанию DC2.
+        timeout: Таймаут подключения в секундах.
+
+    Returns:
+        Время рукопожатия с прокси и подключения к цели в секундах или None, если прокси
+        не ответил или не может быть проверен (например, из-за неизвестного типа).
+
+    Example:
+        >>> latency = await check_proxy(proxy)
+        >>> print("dead" if latency is None else f"{latency * 1000:.0f} ms")
+    """
+    started = time.perf_counter()
+    try:
+        connector = AsyncProxy(
+            python_socks.ProxyType[proxy.network_type],
+            proxy.host,
+            proxy.port,
+            username=proxy.username,
+            password=proxy.password,
+        )
+        sock = await connector.connect(*target, timeout=timeout)
+    except Exception:
+        # любая ошибка проверки означает нерабочий прокси, а не падение воркера
+        return None
+
+    latency = time.perf_counter() - started
+    sock.close()
+    return latency
+
+
+async def check_proxies(
+    proxies: Optional[Iterable[Proxy]] = None,
+    concurrency: int = 100,
+    timeout: float = 10,
+    time_budget: Optional[float] = None,
+    target: tuple[str, int] = _DEFAULT_TARGET,
+    dead_time: Optional[float] = None,
+) -> ProxyHealthReport:
+    """Проверяет прокси с ограничением параллельности и помечает нерабочие.
+
+    Живым прокси записывается задержка подключения, у нерабочих размыкается
+    автомат отключения, и они исключаются из выдачи `ProxyStorage.get_proxy`.
+
+    Args:
+        proxies: Прокси для проверки. По умолчанию все прокси из глобального хранилища.
+        concurrency: Максимальное число одновременных проверок.
+        timeout: Таймаут одной проверки в секундах.
+        time_budget: Лимит времени на весь проход. Непроверенные прокси попадают в `skipped`.
+        target: Адрес (host, port), до которого открывается туннель.
+        dead_time: Минимальное время исключения нерабочего прокси из выдачи в секундах.
+
+    Returns:
+        Объект ProxyHealthReport с результатами проверки.
+
+    Example:
+        >>> report = await check_proxies(concurrency=200, time_budget=30)
+        >>> print(f"Живых: {len(report.alive)}, мёртвых: {len(report.dead)}")
+    """
+    queue = proxy_storage.get_proxies() if proxies is None else list(proxies)
+    queue.reverse()
+    report = ProxyHealthReport()
+    check_kwargs = {} if dead_time is None else {"dead_time": dead_time}
+    started = time.perf_counter()
+
+    async def worker():
+        while queue:
+            proxy = queue.pop()
+            try:
+                latency = await check_proxy(proxy, target=target, timeout=timeout)
+            except asyncio.CancelledError:
+                report.skipped.append(proxy)
+                raise
+
+            proxy.check_update(latency, **check_kwargs)
+            (report.dead if latency is None else report.alive).append(proxy)
+
+    workers = [asyncio.create_task(worker()) for _ in range(min(concurrency, len(queue)))]
+    if workers:
+        _, pending = await asyncio.wait(workers, timeout=time_budget)
+        for task in pending:
+            task.cancel()
+
+        with contextlib.suppress(asyncio.CancelledError):
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    report.skipped.extend(reversed(queue))
+    report.elapsed = time.perf_counter() - started
+    return report
+
+
+async def run_proxies_health_check(
+    interval: int = 60,
+    concurrency: int = 100,
+    timeout: float = 10,
+    time_budget: Optional[float] = None,
+    target: tuple[str, int] = _DEFAULT_TARGET,
+) -> None:
+    """Запускает периодическую проверку всех прокси глобального хранилища.
+
+    Args:
+        interval: Пауза между проходами в секундах.
+        concurrency: Максимальное число одновременных проверок.
+        timeout: Таймаут одной проверки в секундах.
+        time_budget: Лимит времени на один проход (по умолчанию равен `interval`).
+        target: Адрес (host, port), до которого открывается туннель.
+
+    Example:
+        >>> await run_proxies_health_check(interval=120, concurrency=200)
+    """
+    await run_fetch_task(
+        check_proxies,
+        interval,
+        concurrency=concurrency,
+        timeout=timeout,
+        time_budget=interval if time_budget is None else time_budget,
+        target=target,
+    )
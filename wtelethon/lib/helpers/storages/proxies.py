@@ -1,32 +1,432 @@
 import asyncio
-import contextlib
-from typing import Awaitable, Callable, Literal
+import atexit
+import collections
+import itertools
+import os
+import urllib.error
+import urllib.request
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Iterator, Literal, Optional, TextIO
 
-from wtelethon.storages import proxy_storage
+from wtelethon.lib.helpers.tasks import run_fetch_task
+from wtelethon.storages import proxy_storage, Proxy
 from loguru import logger
 
 
-def _sync_load_proxies_from_file(filename: str, network_type: Literal["socks5", "http"]) -> None:
-    with open(filename, mode="r", encoding="utf-8") as file:
-        content = file.read()
-        proxies = [line for _ in content.split("\n") if (line := _.strip())]
+_LOAD_BATCH_SIZE: int = 10_000
+_LOAD_MAX_STORED_ERRORS: int = 100
+_METRICS_CONTENT_TYPE: str = "text/plain; version=0.0.4; charset=utf-8"
+_SYNC_HTTP_TIMEOUT: float = 30.0
 
-    for proxy in proxies:
-        proxy_storage.add_proxy(proxy, network_type=network_type)
 
+@dataclass
+class ProxyLoadReport:
+    """Результат загрузки прокси из файла."""
 
-async def load_proxies_from_file(filename: str, network_type: Literal["socks5", "http"]) -> None:
-    """Загружает прокси из файла в глобальное хранилище.
+    loaded: int = 0
+    duplicates: int = 0
+    errors_count: int = 0
+    errors: list[tuple[int, str]] = field(default_factory=list)
+
+    def add_error(self, line_number: int, message: str) -> None:
+        self.errors_count += 1
+        if len(self.errors) < _LOAD_MAX_STORED_ERRORS:
+            self.errors.append((line_number, message))
+
+
+def _parse_proxies_batch(
+    lines: Iterator[tuple[int, str]],
+    network_type: Literal["socks5", "http"],
+    report: ProxyLoadReport,
+    batch_size: int,
+    tags: Optional[dict[str, str]] = None,
+) -> Optional[list[Proxy]]:
+    batch, consumed = [], 0
+    for line_number, line in itertools.islice(lines, batch_size):
+        consumed += 1
+        if not (line := line.strip()) or line.startswith("#"):
+            continue
+
+        try:
+            batch.append(Proxy.from_string(line, network_type, tags=tags))
+        except ValueError as exc:
+            report.add_error(line_number, str(exc))
+
+    return batch if consumed else None
+
+
+@dataclass
+class ProxySyncReport:
+    """Результат синхронизации хранилища с источником прокси."""
+
+    unchanged_source: bool = False
+    added: int = 0
+    removed: int = 0
+    retiring: int = 0
+    unchanged: int = 0
+    errors_count: int = 0
+    errors: list[tuple[int, str]] = field(default_factory=list)
+
+    def add_error(self, line_number: int, message: str) -> None:
+        self.errors_count += 1
+        if len(self.errors) < _LOAD_MAX_STORED_ERRORS:
+            self.errors.append((line_number, message))
+
+
+def _add_proxies_batch(batch: list[Proxy], report: ProxyLoadReport) -> None:
+    loaded = proxy_storage.add_proxies(batch, replace=False)
+    report.loaded += loaded
+    report.duplicates += len(batch) - loaded
+
+
+def _iter_lines(file: TextIO) -> Iterator[tuple[int, str]]:
+    return enumerate(file, start=1)
+
+
+async def load_proxies_from_file(
+    filename: str,
+    network_type: Literal["socks5", "http"],
+    batch_size: int = _LOAD_BATCH_SIZE,
+    tags: Optional[dict[str, str]] = None,
+) -> ProxyLoadReport:
+    """Потоково загружает прокси из файла в глобальное хранилище.
+
+    Файл читается и разбирается пачками в отдельном потоке, поэтому память
+    не зависит от размера файла. Пачки добавляются в хранилище в потоке
+    event loop. Прокси дедуплицируются по каноническому виду
+    (`Proxy.canonical_source`), ошибочные строки пропускаются и попадают в отчёт.
 
     Args:
-        filename: Путь к файлу с прокси (по одному на строку).
-        network_type: Тип прокси - "socks5" или "http".
+        filename: Путь к файлу с прокси (по одному на строку, строки с # игнорируются).
+        network_type: Тип прокси для строк без схемы - "socks5" или "http".
+        batch_size: Количество строк в одной пачке.
+        tags: Метки для всех прокси файла, например {"provider": "acme", "country": "US"}.
+
+    Returns:
+        Объект ProxyLoadReport со статистикой загрузки.
 
     Example:
         >>> # Загрузить SOCKS5 прокси
-        >>> await load_proxies_from_file("socks5_proxies.txt", "socks5")
+        >>> report = await load_proxies_from_file("socks5_proxies.txt", "socks5")
+        >>> print(f"Загружено: {report.loaded}, ошибок: {report.errors_count}")
         >>>
         >>> # Загрузить HTTP прокси
         >>> await load_proxies_from_file("http_proxies.txt", "http")
+        >>>
+        >>> # Пометить прокси провайдера и страны
+        >>> await load_proxies_from_file("us.txt", "socks5", tags={"provider": "acme", "country": "US"})
+    """
+    report = ProxyLoadReport()
+
+    file = await asyncio.to_thread(open, filename, mode="r", encoding="utf-8")
+    try:
+        lines = _iter_lines(file)
+        while (
+            batch := await asyncio.to_thread(_parse_proxies_batch, lines, network_type, report, batch_size, tags)
+        ) is not None:
+            _add_proxies_batch(batch, report)
+
+    finally:
+        await asyncio.to_thread(file.close)
+
+    if report.errors_count:
+        logger.warning(f"Skipped {report.errors_count} invalid proxy lines in {filename}")
+
+    return report
+
+
+def _is_http_source(source: str) -> bool:
+    return source.startswith(("http://", "https://"))
+
+
+def _read_lines(text: Iterable[str]) -> set[str]:
+    return {line for line in map(str.strip, text) if line and not line.startswith("#")}
+
+
+def _sync_read_proxy_source(source: str, fingerprint: Any) -> tuple[Any, Optional[set[str]]]:
+    """Читает строки источника или возвращает None вместо строк, если источник не менялся."""
+    if not _is_http_source(source):
+        stat = os.stat(source)
+        current = (stat.st_mtime_ns, stat.st_size)
+        if current == fingerprint:
+            return fingerprint, None
+
+        with open(source, mode="r", encoding="utf-8") as file:
+            return current, _read_lines(file)
+
+    request = urllib.request.Request(source)
+    if fingerprint is not None:
+        etag, last_modified = fingerprint
+        if etag:
+            request.add_header("If-None-Match", etag)
+        if last_modified:
+            request.add_header("If-Modified-Since", last_modified)
+
+    try:
+        with urllib.request.urlopen(request, timeout=_SYNC_HTTP_TIMEOUT) as response:
+            current = (response.headers.get("ETag"), response.headers.get("Last-Modified"))
+            charset = response.headers.get_content_charset() or "utf-8"
+            return current, _read_lines(response.read().decode(charset).splitlines())
+
+    except urllib.error.HTTPError as exc:
+        if exc.code == 304:
+            return fingerprint, None
+
+        raise
+
+
+def _parse_proxy_lines(
+    lines: Iterable[str],
+    network_type: Literal["socks5", "http"],
+    tags: Optional[dict[str, str]],
+    report: ProxySyncReport,
+) -> dict[str, Optional[Proxy]]:
+    parsed = {}
+    for line in lines:
+        try:
+            parsed[line] = Proxy.from_string(line, network_type, tags=tags)
+        except ValueError as exc:
+            parsed[line] = None
+            report.add_error(0, str(exc))
+
+    return parsed
+
+
+class ProxySourceSync:
+    """Синхронизация хранилища прокси с файлом или HTTP endpoint.
+
+    Источник - список прокси по одному на строку (строки с # игнорируются).
+    При каждой синхронизации вычисляется разница с предыдущим списком:
+    новые прокси добавляются, пропавшие выводятся через
+    `ProxyStorage.retire_proxy` (после окончания аренд), а у оставшихся
+    сохраняется накопленное состояние. Выводятся только прокси, которые
+    добавила эта синхронизация: прокси, уже бывшие в хранилище (добавленные
+    вручную или другим загрузчиком), остаются в нём.
+
+    Неизменённый источник не перечитывается (время изменения и размер файла,
+    ETag/Last-Modified для HTTP). Разбор строк и изменение хранилища идут
+    только для добавленных и удалённых строк, поэтому время применения
+    списка на 100k прокси пропорционально числу изменений.
+
+    Attributes:
+        source: Путь к файлу или URL (http:// или https://).
+        network_type: Тип прокси для строк без схемы.
+        tags: Метки для всех прокси источника.
+    """
+
+    source: str
+    network_type: Literal["socks5", "http"]
+    tags: Optional[dict[str, str]]
+
+    _fingerprint: Any
+    _lines: dict[str, Optional[str]]
+    _refs: collections.Counter
+    _owned: set[str]
+    _lock: asyncio.Lock
+
+    def __init__(
+        self,
+        source: str,
+        network_type: Literal["socks5", "http"],
+        tags: Optional[dict[str, str]] = None,
+    ):
+        self.source = source
+        self.network_type = network_type
+        self.tags = tags
+        self._fingerprint = None
+        self._lines = {}
+        self._refs = collections.Counter()
+        self._owned = set()
+        self._lock = asyncio.Lock()
+
+    @property
+    def proxies_count(self) -> int:
+        """Количество прокси источника по последней синхронизации."""
+        return len(self._refs)
+
+    async def sync(self) -> ProxySyncReport:
+        """Читает источник и применяет разницу к глобальному хранилищу.
+
+        Returns:
+            Объект ProxySyncReport. Номера строк в ошибках не сохраняются (0).
+
+        Example:
+            >>> report = await ProxySourceSync("./data/proxies.txt", "socks5").sync()
+            >>> print(f"+{report.added} -{report.removed}")
+        """
+        async with self._lock:
+            report = ProxySyncReport()
+
+            fingerprint, lines = await asyncio.to_thread(
+                _sync_read_proxy_source, self.source, self._fingerprint
+            )
+            if lines is None:
+                report.unchanged_source = True
+                report.unchanged = len(self._lines)
+                return report
+
+            added = lines.difference(self._lines)
+            removed = self._lines.keys() - lines
+            parsed = await asyncio.to_thread(_parse_proxy_lines, added, self.network_type, self.tags, report)
+
+            self._apply(parsed, removed, report)
+            self._fingerprint = fingerprint
+            report.unchanged = len(lines) - len(added)
+
+        if report.errors_count:
+            logger.warning(f"Skipped {report.errors_count} invalid proxy lines in {self.source}")
+
+        return report
+
+    def _apply(
+        self,
+        parsed: dict[str, Optional[Proxy]],
+        removed: Iterable[str],
+        report: ProxySyncReport,
+    ) -> None:
+        new_proxies = []
+        for line, proxy in parsed.items():
+            self._lines[line] = None if proxy is None else proxy.source
+            if proxy is None:
+                continue
+
+            # несколько строк могут описывать один прокси в разной записи
+            self._refs[proxy.source] += 1
+            if self._refs[proxy.source] == 1:
+                new_proxies.append(proxy)
+
+        retired = []
+        for line in removed:
+            if (source := self._lines.pop(line)) is None:
+                continue
+
+            self._refs[source] -= 1
+            if not self._refs[source]:
+                del self._refs[source]
+                if source in self._owned:
+                    self._owned.discard(source)
+                    retired.append(source)
+
+        # прокси, которые уже есть в хранилище, принадлежат не этой синхронизации
+        foreign = {
+            proxy.source for proxy in new_proxies if proxy_storage.get_proxy_by_source(proxy.source) is not None
+        }
+        report.added = proxy_storage.add_proxies(new_proxies, replace=False)
+        self._owned.update(proxy.source for proxy in new_proxies if proxy.source not in foreign)
+
+        for source in retired:
+            try:
+                removed_now = proxy_storage.retire_proxy(source)
+            except ValueError:
+                # прокси уже удалён из хранилища вручную
+                continue
+
+            report.removed += 1
+            if not removed_now:
+                report.retiring += 1
+
+
+async def run_proxy_source_sync(
+    source: str,
+    network_type: Literal["socks5", "http"],
+    interval: int = 60,
+    tags: Optional[dict[str, str]] = None,
+) -> ProxySourceSync:
+    """Загружает прокси из источника и запускает его периодическую синхронизацию.
+
+    Args:
+        source: Путь к файлу или URL (http:// или https://) со списком прокси.
+        network_type: Тип прокси для строк без схемы - "socks5" или "http".
+        interval: Интервал синхронизации в секундах.
+        tags: Метки для всех прокси источника.
+
+    Returns:
+        Объект ProxySourceSync (его `sync()` можно вызвать и вручную).
+
+    Example:
+        >>> await run_proxy_source_sync("./data/proxies.txt", "socks5", interval=30)
+        >>> await run_proxy_source_sync("http://127.0.0.1:8000/proxies.txt", "http", tags={"provider": "acme"})
+    """
+    source_sync = ProxySourceSync(source, network_type, tags)
+    await source_sync.sync()
+
+    # первая итерация задачи увидит неизменённый источник и ничего не перечитает
+    await run_fetch_task(source_sync.sync, interval)
+    return source_sync
+
+
+async def run_proxy_state_snapshots(path: str, interval: int = 60, restore: bool = True) -> int:
+    """Восстанавливает состояние прокси из снимка и запускает его периодическое сохранение.
+
+    Снимок также сохраняется при завершении процесса.
+
+    Args:
+        path: Путь к SQLite файлу снимка.
+        interval: Интервал сохранения в секундах.
+        restore: Если True, сначала восстанавливает состояние из снимка.
+
+    Returns:
+        Количество прокси, для которых состояние восстановлено.
+
+    Example:
+        >>> await load_proxies_from_file("./data/proxies.txt", "socks5")
+        >>> await run_proxy_state_snapshots("./data/proxy_state.sqlite", interval=30)
+    """
+    restored = await proxy_storage.load_state(path) if restore else 0
+
+    await run_fetch_task(proxy_storage.save_state, interval, path)
+    atexit.register(proxy_storage._sync_save_state, path)
+    return restored
+
+
+async def _serve_metrics_request(
+    reader: asyncio.StreamReader, writer: asyncio.StreamWriter, path: str
+) -> None:
+    try:
+        request_line = await reader.readline()
+        while await reader.readline() not in (b"", b"\r\n", b"\n"):
+            pass
+
+        method, _, target = request_line.decode("latin-1").partition(" ")
+        if method == "GET" and target.split(" ", 1)[0].split("?", 1)[0] == path:
+            status, body = "200 OK", proxy_storage.render_metrics().encode()
+        else:
+            status, body = "404 Not Found", b"Not Found\n"
+
+        writer.write(
+            f"HTTP/1.1 {status}\r\nContent-Type: {_METRICS_CONTENT_TYPE}\r\n"
+            f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode()
+            + body
+        )
+        await writer.drain()
+
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+
+    finally:
+        writer.close()
+
+
+async def run_proxy_metrics_server(
+    host: str = "127.0.0.1", port: int = 9108, path: str = "/metrics"
+) -> asyncio.AbstractServer:
+    """Запускает HTTP endpoint с метриками прокси для Prometheus.
+
+    Метрики формируются `ProxyStorage.render_metrics` в потоке event loop
+    только в момент запроса, поэтому на выдачу прокси сервер не влияет.
+
+    Args:
+        host: Адрес для прослушивания.
+        port: Порт для прослушивания.
+        path: Путь, по которому отдаются метрики.
+
+    Returns:
+        Запущенный asyncio сервер (остановка - `server.close()`).
+
+    Example:
+        >>> server = await run_proxy_metrics_server(port=9108)
+        >>> # curl http://127.0.0.1:9108/metrics
     """
-    await asyncio.to_thread(_sync_load_proxies_from_file, filename=filename, network_type=network_type)
+    return await asyncio.start_server(
+        lambda reader, writer: _serve_metrics_request(reader, writer, path), host, port
+    )
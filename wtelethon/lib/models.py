@@ -16,6 +16,13 @@ DEAD_EXCEPTIONS = (
     struct.error,
 )
 
+# ожидания, привязанные к аккаунту и запросу (SlowModeWait относится к чату, поэтому не входит)
+FLOOD_WAIT_EXCEPTIONS = (
+    tl_errors.FloodWaitError,
+    tl_errors.FloodPremiumWaitError,
+    tl_errors.FloodTestPhoneWaitError,
+)
+
 
 TGDC = {
     1: ["149.154.175.53"],
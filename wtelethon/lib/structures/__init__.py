@@ -0,0 +1,9 @@
+from .heap import IndexedHeap
+from .grouped_heap import GroupedHeap
+from .fenwick import FenwickTree
+from .weighted_set import WeightedSet
+from .hashring import HashRing
+from .timer_wheel import TimerWheel
+from .token_bucket import TokenBucket
+
+__all__ = ["IndexedHeap", "GroupedHeap", "FenwickTree", "WeightedSet", "HashRing", "TimerWheel", "TokenBucket"]
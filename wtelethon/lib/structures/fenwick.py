@@ -0,0 +1,105 @@
+from typing import Iterable, Optional
+
+
+class FenwickTree:
+    """Дерево Фенвика (BIT) над неотрицательными весами.
+
+    Поддерживает изменение веса слота и выбор слота пропорционально весу
+    за O(log n). Используется для взвешенного случайного выбора.
+
+    Example:
+        >>> tree = FenwickTree()
+        >>> tree.set(0, 1.0)
+        >>> tree.set(1, 3.0)
+        >>> tree.find(2.5)
+        1
+    """
+
+    _tree: list[float]
+    _values: list[float]
+
+    def __init__(self, capacity: int = 16):
+        self._tree = [0.0] * (capacity + 1)
+        self._values = [0.0] * capacity
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    @property
+    def total(self) -> float:
+        return self.prefix_sum(len(self._values))
+
+    def get(self, index: int) -> float:
+        return self._values[index] if index < len(self._values) else 0.0
+
+    def set(self, index: int, value: float) -> None:
+        """Устанавливает вес слота, при необходимости расширяя дерево."""
+        if index >= len(self._values):
+            self._grow(index + 1)
+
+        delta = value - self._values[index]
+        if not delta:
+            return
+
+        self._values[index] = value
+        position = index + 1
+        while position < len(self._tree):
+            self._tree[position] += delta
+            position += position & -position
+
+    def update_many(self, items: Iterable[tuple[int, float]]) -> None:
+        """Устанавливает веса пачки слотов, перестраивая дерево один раз."""
+        items = list(items)
+        if len(items) < len(self._values) // 4:
+            for index, value in items:
+                self.set(index, value)
+            return
+
+        for index, value in items:
+            if index >= len(self._values):
+                self._values.extend([0.0] * (max(index + 1, len(self._values) * 2) - len(self._values)))
+
+            self._values[index] = value
+
+        self.rebuild()
+
+    def prefix_sum(self, count: int) -> float:
+        """Сумма весов первых `count` слотов."""
+        result = 0.0
+        while count > 0:
+            result += self._tree[count]
+            count -= count & -count
+
+        return result
+
+    def find(self, target: float) -> Optional[int]:
+        """Возвращает первый слот, на котором префиксная сумма превышает `target`.
+
+        Returns:
+            Индекс слота или None, если `target` не меньше суммы всех весов.
+        """
+        position = 0
+        step = 1 << (len(self._values).bit_length())
+        while step:
+            next_position = position + step
+            if next_position < len(self._tree) and self._tree[next_position] <= target:
+                position = next_position
+                target -= self._tree[next_position]
+
+            step >>= 1
+
+        return position if position < len(self._values) else None
+
+    def rebuild(self) -> None:
+        """Пересчитывает дерево из весов, сбрасывая накопленную погрешность."""
+        size = len(self._values)
+        self._tree = [0.0] + list(self._values)
+        for position in range(1, size + 1):
+            parent = position + (position & -position)
+            if parent <= size:
+                self._tree[parent] += self._tree[position]
+
+    def _grow(self, min_capacity: int) -> None:
+        capacity = max(min_capacity, len(self._values) * 2)
+        self._values.extend([0.0] * (capacity - len(self._values)))
+        self.rebuild()
@@ -0,0 +1,113 @@
+import collections
+from typing import Callable, Generic, Hashable, Iterable, Iterator, Optional, TypeVar
+
+from .heap import IndexedHeap
+
+
+K = TypeVar("K", bound=Hashable)
+G = TypeVar("G", bound=Hashable)
+
+
+class GroupedHeap(Generic[K, G]):
+    """IndexedHeap со вторичными кучами по группам ключей.
+
+    Каждый ключ дополнительно хранится в куче каждой своей группы
+    (`groups_of(key)`), поэтому минимум внутри группы доступен за O(1),
+    а любое изменение стоит O(g log n), где g - число групп ключа.
+    Набор групп ключа не должен меняться, пока ключ лежит в куче.
+
+    Example:
+        >>> heap = GroupedHeap(lambda key: [key[0]])
+        >>> heap.push("a1", 2.0)
+        >>> heap.push("b1", 1.0)
+        >>> heap.push("a2", 3.0)
+        >>> heap.peek()
+        (1.0, 'b1')
+        >>> heap.group("a").peek()
+        (2.0, 'a1')
+    """
+
+    _heap: IndexedHeap[K]
+    _groups: dict[G, IndexedHeap[K]]
+    _groups_of: Callable[[K], Iterable[G]]
+
+    def __init__(self, groups_of: Callable[[K], Iterable[G]]):
+        self._heap = IndexedHeap()
+        self._groups = {}
+        self._groups_of = groups_of
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def __contains__(self, key: K) -> bool:
+        return key in self._heap
+
+    def __iter__(self) -> Iterator[K]:
+        return iter(self._heap)
+
+    def group(self, group: G) -> Optional[IndexedHeap[K]]:
+        """Возвращает кучу группы (только для чтения) или None, если в группе нет ключей."""
+        return self._groups.get(group)
+
+    def priority(self, key: K) -> Optional[float]:
+        return self._heap.priority(key)
+
+    def key_at(self, position: int) -> K:
+        return self._heap.key_at(position)
+
+    def iter_sorted(self) -> Iterator[tuple[float, K]]:
+        return self._heap.iter_sorted()
+
+    def peek(self) -> Optional[tuple[float, K]]:
+        return self._heap.peek()
+
+    def push(self, key: K, priority: float) -> None:
+        self._heap.push(key, priority)
+        for group in self._groups_of(key):
+            if (heap := self._groups.get(group)) is None:
+                heap = self._groups[group] = IndexedHeap()
+
+            heap.push(key, priority)
+
+    def extend(self, items: Iterable[tuple[K, float]]) -> None:
+        items = list(items)
+        self._heap.extend(items)
+
+        grouped = collections.defaultdict(list)
+        for key, priority in items:
+            for group in self._groups_of(key):
+                grouped[group].append((key, priority))
+
+        for group, group_items in grouped.items():
+            if (heap := self._groups.get(group)) is None:
+                heap = self._groups[group] = IndexedHeap()
+
+            heap.extend(group_items)
+
+    def update(self, key: K, priority: float) -> None:
+        self._heap.update(key, priority)
+        for group in self._groups_of(key):
+            self._groups[group].update(key, priority)
+
+    def pop(self) -> Optional[tuple[float, K]]:
+        if (item := self._heap.peek()) is None:
+            return None
+
+        self.remove(item[1])
+        return item
+
+    def remove(self, key: K) -> bool:
+        if not self._heap.remove(key):
+            return False
+
+        for group in self._groups_of(key):
+            heap = self._groups[group]
+            heap.remove(key)
+            if not heap:
+                del self._groups[group]
+
+        return True
+
+    def clear(self) -> None:
+        self._heap.clear()
+        self._groups.clear()
@@ -0,0 +1,96 @@
+import bisect
+import hashlib
+import struct
+from typing import Iterator
+
+
+_POINTS_PER_DIGEST: int = 8
+
+
+def _hash(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest(), "big")
+
+
+def _node_points(node: str, replicas: int) -> Iterator[int]:
+    # один 64-байтный дайджест даёт сразу 8 точек кольца
+    for block in range(0, replicas, _POINTS_PER_DIGEST):
+        digest = hashlib.blake2b(f"{node}#{block}".encode(), digest_size=64).digest()
+        yield from struct.unpack(">8Q", digest)[: replicas - block]
+
+
+class HashRing:
+    """Кольцо консистентного хеширования с виртуальными узлами.
+
+    При добавлении или удалении узла к другому узлу переезжает примерно 1/n
+    ключей. Поиск узла для ключа выполняется бинарным поиском за O(log n).
+    Точки кольца сортируются лениво, поэтому массовое добавление узлов
+    не требует вставки в середину списка на каждый узел.
+
+    Example:
+        >>> ring = HashRing()
+        >>> ring.add("proxy-1")
+        >>> ring.add("proxy-2")
+        >>> next(ring.iter_nodes("account-42"))
+        'proxy-1'
+    """
+
+    _replicas: int
+    _points: list[int]
+    _owners: dict[int, str]
+    _unsorted: bool
+    _stale: bool
+
+    def __init__(self, replicas: int = 16):
+        self._replicas = replicas
+        self._points = []
+        self._owners = {}
+        self._unsorted = False
+        self._stale = False
+
+    def __len__(self) -> int:
+        return len(self._owners)
+
+    def add(self, node: str) -> None:
+        """Добавляет узел (его виртуальные точки) в кольцо."""
+        for point in _node_points(node, self._replicas):
+            if point in self._owners:
+                continue
+
+            self._owners[point] = node
+            self._points.append(point)
+            self._unsorted = True
+
+    def remove(self, node: str) -> None:
+        """Удаляет узел из кольца."""
+        for point in _node_points(node, self._replicas):
+            if self._owners.get(point) == node:
+                del self._owners[point]
+                self._stale = True
+
+    def iter_nodes(self, key: str) -> Iterator[str]:
+        """Обходит узлы по часовой стрелке, начиная с позиции ключа.
+
+        Первый узел - основной для ключа, следующие - запасные в стабильном
+        порядке, без повторов.
+        """
+        if self._stale:
+            self._points = sorted(self._owners)
+            self._stale = self._unsorted = False
+
+        elif self._unsorted:
+            self._points.sort()
+            self._unsorted = False
+
+        points = self._points
+        if not points:
+            return
+
+        start = bisect.bisect(points, _hash(key))
+        seen = set()
+        for offset in range(len(points)):
+            node = self._owners[points[(start + offset) % len(points)]]
+            if node in seen:
+                continue
+
+            seen.add(node)
+            yield node
@@ -0,0 +1,191 @@
+import heapq
+from typing import Generic, Hashable, Iterable, Iterator, Optional, TypeVar
+
+
+K = TypeVar("K", bound=Hashable)
+
+
+class IndexedHeap(Generic[K]):
+    """Двоичная min-куча с индексом по ключу.
+
+    Хранит пары (priority, key) и позволяет за O(log n) добавлять,
+    удалять и менять приоритет любого ключа, а за O(1) смотреть минимум.
+
+    Example:
+        >>> heap = IndexedHeap()
+        >>> heap.push("a", 2.0)
+        >>> heap.push("b", 1.0)
+        >>> heap.peek()
+        (1.0, 'b')
+        >>> heap.update("b", 3.0)
+        >>> heap.pop()
+        (2.0, 'a')
+    """
+
+    _items: list[list]
+    _index: dict[K, int]
+
+    def __init__(self):
+        self._items = []
+        self._index = {}
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, key: K) -> bool:
+        return key in self._index
+
+    def __iter__(self) -> Iterator[K]:
+        return iter(self._index)
+
+    def priority(self, key: K) -> Optional[float]:
+        """Возвращает приоритет ключа или None если ключа нет в куче."""
+        position = self._index.get(key)
+        return None if position is None else self._items[position][0]
+
+    def iter_sorted(self) -> Iterator[tuple[float, K]]:
+        """Обходит пары (priority, key) по возрастанию приоритета, не изменяя кучу.
+
+        Первые k элементов обходятся за O(k log k). Менять кучу во время обхода нельзя.
+        """
+        items = self._items
+        if not items:
+            return
+
+        frontier = [(items[0][0], 0)]
+        while frontier:
+            priority, position = heapq.heappop(frontier)
+            yield priority, items[position][1]
+
+            for child in (2 * position + 1, 2 * position + 2):
+                if child < len(items):
+                    heapq.heappush(frontier, (items[child][0], child))
+
+    def key_at(self, position: int) -> K:
+        """Возвращает ключ по позиции во внутреннем массиве (для случайного выбора)."""
+        return self._items[position][1]
+
+    def push(self, key: K, priority: float) -> None:
+        """Добавляет ключ или обновляет его приоритет, если он уже в куче."""
+        if key in self._index:
+            self.update(key, priority)
+            return
+
+        self._items.append([priority, key])
+        self._index[key] = len(self._items) - 1
+        self._sift_up(len(self._items) - 1)
+
+    def extend(self, items: Iterable[tuple[K, float]]) -> None:
+        """Добавляет пачку пар (key, priority).
+
+        Для больших пачек куча перестраивается целиком за O(n) вместо
+        O(k log n) поэлементных вставок.
+        """
+        items = list(items)
+        if len(items) < len(self._items) // 4:
+            for key, priority in items:
+                self.push(key, priority)
+            return
+
+        for key, priority in items:
+            position = self._index.get(key)
+            if position is None:
+                self._index[key] = len(self._items)
+                self._items.append([priority, key])
+            else:
+                self._items[position][0] = priority
+
+        for position in reversed(range(len(self._items) // 2)):
+            self._sift_down(position)
+
+    def update(self, key: K, priority: float) -> None:
+        """Меняет приоритет ключа.
+
+        Raises:
+            KeyError: Если ключа нет в куче.
+        """
+        position = self._index[key]
+        old_priority = self._items[position][0]
+        self._items[position][0] = priority
+
+        if priority < old_priority:
+            self._sift_up(position)
+        else:
+            self._sift_down(position)
+
+    def peek(self) -> Optional[tuple[float, K]]:
+        """Возвращает (priority, key) минимального элемента без удаления."""
+        if not self._items:
+            return None
+
+        priority, key = self._items[0]
+        return priority, key
+
+    def pop(self) -> Optional[tuple[float, K]]:
+        """Извлекает минимальный элемент."""
+        if not self._items:
+            return None
+
+        priority, key = self._items[0]
+        self.remove(key)
+        return priority, key
+
+    def remove(self, key: K) -> bool:
+        """Удаляет ключ из кучи.
+
+        Returns:
+            True если ключ был в куче.
+        """
+        position = self._index.pop(key, None)
+        if position is None:
+            return False
+
+        last = self._items.pop()
+        if position == len(self._items):
+            return True
+
+        self._items[position] = last
+        self._index[last[1]] = position
+        self._sift_up(position)
+        self._sift_down(self._index[last[1]])
+        return True
+
+    def clear(self) -> None:
+        self._items.clear()
+        self._index.clear()
+
+    def _swap(self, i: int, j: int) -> None:
+        items = self._items
+        items[i], items[j] = items[j], items[i]
+        self._index[items[i][1]] = i
+        self._index[items[j][1]] = j
+
+    def _sift_up(self, position: int) -> None:
+        items = self._items
+        while position > 0:
+            parent = (position - 1) >> 1
+            if items[position][0] >= items[parent][0]:
+                break
+
+            self._swap(position, parent)
+            position = parent
+
+    def _sift_down(self, position: int) -> None:
+        items = self._items
+        size = len(items)
+        while True:
+            smallest = position
+            left = 2 * position + 1
+            right = left + 1
+
+            if left < size and items[left][0] < items[smallest][0]:
+                smallest = left
+
+            if right < size and items[right][0] < items[smallest][0]:
+                smallest = right
+
+            if smallest == position:
+                break
+
+            self._swap(position, smallest)
+            position = smallest
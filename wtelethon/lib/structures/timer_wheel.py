@@ -0,0 +1,107 @@
+import math
+import time
+from typing import Generic, Hashable, Optional, TypeVar
+
+
+K = TypeVar("K", bound=Hashable)
+
+
+class TimerWheel(Generic[K]):
+    """Хешированное колесо таймеров.
+
+    Ключ с моментом срабатывания попадает в корзину своего тика; `advance`
+    просматривает только корзины тиков, прошедших с прошлого вызова.
+    Добавление и отмена таймера - O(1), частые вызовы `advance` почти
+    ничего не стоят, даже если таймеров много.
+
+    Example:
+        >>> wheel = TimerWheel(tick=0.1)
+        >>> wheel.schedule("proxy-1", time.time() + 5)
+        >>> wheel.advance(time.time() + 6)
+        ['proxy-1']
+    """
+
+    _tick: float
+    _buckets: list[dict[K, float]]
+    _entries: dict[K, tuple[float, int]]
+    _current_tick: int
+
+    def __init__(self, tick: float = 0.1, slots: int = 4096):
+        self._tick = tick
+        self._buckets = [{} for _ in range(slots)]
+        self._entries = {}
+        self._current_tick = math.floor(time.time() / tick)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: K) -> bool:
+        return key in self._entries
+
+    def deadline(self, key: K) -> Optional[float]:
+        entry = self._entries.get(key)
+        return None if entry is None else entry[0]
+
+    def schedule(self, key: K, deadline: float) -> None:
+        """Ставит (или переносит) таймер ключа на момент `deadline`."""
+        self.cancel(key)
+
+        tick = max(math.ceil(deadline / self._tick), self._current_tick + 1)
+        slot = tick % len(self._buckets)
+        self._buckets[slot][key] = deadline
+        self._entries[key] = (deadline, slot)
+
+    def cancel(self, key: K) -> bool:
+        """Отменяет таймер ключа.
+
+        Returns:
+            True если таймер был установлен.
+        """
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+
+        del self._buckets[entry[1]][key]
+        return True
+
+    def advance(self, now: float) -> list[K]:
+        """Снимает и возвращает ключи, чьи таймеры сработали к моменту `now`."""
+        now_tick = math.floor(now / self._tick)
+        if now_tick <= self._current_tick:
+            return []
+
+        slots = len(self._buckets)
+        ticks = range(self._current_tick + 1, now_tick + 1)
+        if len(ticks) >= slots:
+            ticks = range(slots)
+
+        expired = []
+        for tick in ticks:
+            bucket = self._buckets[tick % slots]
+            if not bucket:
+                continue
+
+            for key in [key for key, deadline in bucket.items() if deadline <= now]:
+                del bucket[key]
+                del self._entries[key]
+                expired.append(key)
+
+        self._current_tick = now_tick
+        return expired
+
+    def next_deadline(self) -> Optional[float]:
+        """Возвращает оценку ближайшего срабатывания (не позже реального).
+
+        Смотрит первую непустую корзину после текущего тика, поэтому для
+        таймеров со следующих оборотов колеса результат может быть раньше.
+        """
+        if not self._entries:
+            return None
+
+        slots = len(self._buckets)
+        for offset in range(1, slots + 1):
+            bucket = self._buckets[(self._current_tick + offset) % slots]
+            if bucket:
+                return min(min(bucket.values()), (self._current_tick + offset) * self._tick)
+
+        return None
@@ -0,0 +1,62 @@
+import time
+
+
+class TokenBucket:
+    """Корзина токенов с резервированием.
+
+    `reserve` всегда забирает токен, уводя баланс в минус, и возвращает,
+    сколько нужно подождать до момента, когда этот токен был бы накоплен.
+    Поэтому конкурирующие вызовы выстраиваются в очередь по времени без
+    блокировок, а проверка корзины не создаёт объектов.
+
+    Example:
+        >>> bucket = TokenBucket(rate=1 / 60, capacity=5)  # 5 запросов сразу, далее 1 в минуту
+        >>> delay = bucket.reserve()
+        >>> if delay:
+        >>>     await asyncio.sleep(delay)
+    """
+
+    __slots__ = ("rate", "capacity", "tokens", "updated")
+
+    rate: float
+    capacity: float
+    tokens: float
+    updated: float
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        if rate <= 0 or capacity < 1:
+            raise ValueError("rate must be greater than 0 and capacity at least 1")
+
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def configure(self, rate: float, capacity: float) -> None:
+        """Меняет скорость и ёмкость, сохраняя накопленный баланс."""
+        if rate <= 0 or capacity < 1:
+            raise ValueError("rate must be greater than 0 and capacity at least 1")
+
+        self._refill(time.monotonic())
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = min(self.tokens, capacity)
+
+    def reserve(self) -> float:
+        """Забирает токен и возвращает задержку в секундах (0 - токен был в наличии)."""
+        self._refill(time.monotonic())
+        self.tokens -= 1
+        if self.tokens >= 0:
+            return 0.0
+
+        return -self.tokens / self.rate
+
+    def refund(self) -> None:
+        """Возвращает токен, зарезервированный, но не использованный."""
+        self.tokens = min(self.tokens + 1, self.capacity)
+
+    def _refill(self, now: float) -> None:
+        if self.tokens < self.capacity:
+            self.tokens = min(self.tokens + (now - self.updated) * self.rate, self.capacity)
+
+        self.updated = now
@@ -0,0 +1,86 @@
+import random
+from typing import Generic, Hashable, Optional, TypeVar
+
+from .fenwick import FenwickTree
+
+
+K = TypeVar("K", bound=Hashable)
+
+
+class WeightedSet(Generic[K]):
+    """Набор ключей с весами и выбором ключа пропорционально весу за O(log n).
+
+    Поверх FenwickTree хранит соответствие ключей слотам дерева;
+    слоты удалённых ключей переиспользуются.
+
+    Example:
+        >>> weights = WeightedSet()
+        >>> weights.set("a", 1.0)
+        >>> weights.set("b", 0.0)
+        >>> weights.sample()
+        'a'
+    """
+
+    _tree: FenwickTree
+    _slots: dict[K, int]
+    _keys: list[Optional[K]]
+    _free_slots: list[int]
+
+    def __init__(self):
+        self._tree = FenwickTree()
+        self._slots = {}
+        self._keys = []
+        self._free_slots = []
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def __contains__(self, key: K) -> bool:
+        return key in self._slots
+
+    @property
+    def total(self) -> float:
+        return self._tree.total
+
+    def get(self, key: K) -> float:
+        slot = self._slots.get(key)
+        return 0.0 if slot is None else self._tree.get(slot)
+
+    def set(self, key: K, weight: float) -> None:
+        """Добавляет ключ или меняет его вес."""
+        if (slot := self._slots.get(key)) is None:
+            if self._free_slots:
+                slot = self._free_slots.pop()
+                self._keys[slot] = key
+            else:
+                slot = len(self._keys)
+                self._keys.append(key)
+
+            self._slots[key] = slot
+
+        self._tree.set(slot, weight)
+
+    def remove(self, key: K) -> bool:
+        """Удаляет ключ. Возвращает True, если ключ был в наборе."""
+        if (slot := self._slots.pop(key, None)) is None:
+            return False
+
+        self._tree.set(slot, 0.0)
+        self._keys[slot] = None
+        self._free_slots.append(slot)
+        return True
+
+    def sample(self) -> Optional[K]:
+        """Возвращает случайный ключ пропорционально весу или None, если все веса нулевые."""
+        for _ in range(2):
+            if (total := self._tree.total) <= 0:
+                return None
+
+            slot = self._tree.find(random.random() * total)
+            if slot is not None and self._keys[slot] is not None and self._tree.get(slot):
+                return self._keys[slot]
+
+            # накопленная погрешность float: пересобираем дерево один раз
+            self._tree.rebuild()
+
+        return None
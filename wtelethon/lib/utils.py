@@ -4,10 +4,7 @@ import random
 import re
 import os
 import struct
-import phonenumbers
-from phonenumbers import timezone as phonenumbers_timezone
 from typing import Optional, TYPE_CHECKING
-import pytz
 from wtelethon import tl_errors, models, tl_types
 import urllib.parse
 
@@ -150,6 +147,25 @@ def is_connection_error(exc: Exception) -> bool:
     return isinstance(exc, ConnectionError)
 
 
+def is_flood_wait_error(exc: Exception) -> bool:
+    """Проверяет, является ли исключение ожиданием из-за флуда (FLOOD_WAIT и аналоги).
+
+    Args:
+        exc: Исключение для проверки.
+
+    Returns:
+        True если у исключения есть `seconds` - время ожидания аккаунта.
+
+    Example:
+        >>> try:
+        >>>     await client.send_message("me", "test")
+        >>> except Exception as e:
+        >>>     if is_flood_wait_error(e):
+        >>>         print(f"Флуд, ждать {e.seconds} секунд")
+    """
+    return isinstance(exc, models.FLOOD_WAIT_EXCEPTIONS)
+
+
 def is_recaptcha_error(exc: Exception) -> bool:
     """Проверяет, требует ли исключение решения reCAPTCHA.
 
@@ -271,6 +287,10 @@ def match_tz_offset_by_number(phone_number: str) -> int:
     if not phone_number.startswith("+"):
         phone_number = "+" + phone_number.lstrip("+0")
 
+    # phonenumbers с таймзонами - одна из самых тяжёлых зависимостей, грузим по требованию
+    import phonenumbers
+    from phonenumbers import timezone as phonenumbers_timezone
+
     parsed = phonenumbers.parse(phone_number)
     if not phonenumbers.is_valid_number(parsed):
         raise ValueError(f"Invalid phone number: {phone_number}")
@@ -286,6 +306,34 @@ def match_tz_offset_by_number(phone_number: str) -> int:
     return tz_offset
 
 
+def match_country_by_number(phone_number: Optional[str]) -> Optional[str]:
+    """Определяет страну по номеру телефона с помощью phonenumbers.
+
+    Args:
+        phone_number: Номер телефона.
+
+    Returns:
+        Код страны ISO 3166-1 alpha-2 (например "US") или None если номер не задан.
+
+    Example:
+        >>> match_country_by_number("+14155552671")
+        'US'
+    """
+    if not phone_number or not (phone_number := str(phone_number)):
+        return None
+
+    if not phone_number.startswith("+"):
+        phone_number = "+" + phone_number.lstrip("+0")
+
+    import phonenumbers
+
+    parsed = phonenumbers.parse(phone_number)
+    if not phonenumbers.is_valid_number(parsed):
+        raise ValueError(f"Invalid phone number: {phone_number}")
+
+    return phonenumbers.region_code_for_number(parsed)
+
+
 def hex_to_base64(hex_string: str) -> str:
     """Преобразует hex строку в base64.
 
@@ -305,6 +353,8 @@ def match_lang_code_by_number(phone_number: Optional[str], lang_codes: list[str]
     if not phone_number.startswith("+"):
         phone_number = "+" + phone_number.lstrip("+0")
 
+    import phonenumbers
+
     parsed = phonenumbers.parse(phone_number)
     if not phonenumbers.is_valid_number(parsed):
         raise ValueError(f"Invalid phone number: {phone_number}")
@@ -14,14 +14,29 @@ from telethon.sessions import Session
 from telethon.tl import functions
 from telethon.tl.alltlobjects import LAYER
 
+from wtelethon.storages import connection_budget
+
 import inspect
+import time
 
 if typing.TYPE_CHECKING:
     from wtelethon import TelegramClient
 
 
+_original_disconnect_coro = TelethonBaseClientOriginal._disconnect_coro
+
+
 class TelegramBaseClient(TelethonBaseClientOriginal):
 
+    async def _disconnect_coro(self: "TelegramClient"):
+        try:
+            await _original_disconnect_coro(self)
+        finally:
+            if not connection_budget.is_evicting(self):
+                self.release_proxy_lease()
+
+            connection_budget.release(self)
+
     async def connect(self: "TelegramClient") -> None:
         if self.session is None:
             raise ValueError(
@@ -35,6 +50,10 @@ class TelegramBaseClient(TelethonBaseClientOriginal):
                 "The asyncio event loop must not change after connection (see the FAQ for details)"
             )
 
+        if connection_budget.enabled:
+            await connection_budget.acquire(self)
+
+        connect_started = time.perf_counter()
         try:
             if not await self._sender.connect(
                 self._connection(
@@ -50,8 +69,15 @@ class TelegramBaseClient(TelethonBaseClientOriginal):
                 return
 
         except Exception as e:
+            connection_budget.release(self)
+            if self.current_proxy:
+                self.current_proxy.record_connect(None)
+
             return await self.handle_exception(None, e)
 
+        if self.current_proxy:
+            self.current_proxy.record_connect(time.perf_counter() - connect_started)
+
         self.session.auth_key = self._sender.auth_key
         self.session.save()
 
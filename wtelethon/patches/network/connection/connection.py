@@ -0,0 +1,20 @@
+from telethon.network.connection.connection import Connection as ConnectionOriginal
+
+from wtelethon.storages import tunnel_pool
+
+
+_original_proxy_connect = ConnectionOriginal._proxy_connect
+
+
+class Connection(ConnectionOriginal):
+    async def _proxy_connect(self, timeout=None, local_addr=None):
+        if not tunnel_pool.enabled or local_addr is not None or not isinstance(self._proxy, tuple):
+            return await _original_proxy_connect(self, timeout=timeout, local_addr=local_addr)
+
+        sock = tunnel_pool.take(self._proxy, self._ip, self._port)
+        tunnel_pool.refill(self._proxy, self._ip, self._port)
+
+        if sock is None:
+            sock = await _original_proxy_connect(self, timeout=timeout, local_addr=local_addr)
+
+        return sock
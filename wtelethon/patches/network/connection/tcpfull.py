@@ -6,8 +6,32 @@ from zlib import crc32
 
 from telethon.network.connection.tcpfull import FullPacketCodec as FullPacketCodecOriginal
 
+from wtelethon.storages import proxy_storage
+
+
+_original_encode_packet = FullPacketCodecOriginal.encode_packet
+
+_UNRESOLVED = object()
+
+
+def _traffic_proxy(codec):
+    """Возвращает прокси хранилища, через который работает соединение кодека."""
+    # кодек создаётся на каждое подключение, поэтому прокси ищется один раз
+    proxy = codec.__dict__.get("_traffic_proxy", _UNRESOLVED)
+    if proxy is _UNRESOLVED:
+        proxy = codec._traffic_proxy = proxy_storage.find_client_proxy(codec._conn._proxy)
+
+    return proxy
+
 
 class FullPacketCodec(FullPacketCodecOriginal):
+    def encode_packet(self, data):
+        packet = _original_encode_packet(self, data)
+        if (proxy := _traffic_proxy(self)) is not None:
+            proxy.record_traffic(sent=len(packet))
+
+        return packet
+
     async def read_packet(self, reader):
         try:
             packet_len_seq = await reader.readexactly(4)  # 4 and 4
@@ -47,4 +71,7 @@ class FullPacketCodec(FullPacketCodecOriginal):
         if checksum != valid_checksum:
             raise InvalidChecksumError(checksum, valid_checksum)
 
+        if (proxy := _traffic_proxy(self)) is not None:
+            proxy.record_traffic(received=packet_len)
+
         return body
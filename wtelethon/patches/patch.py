@@ -1,16 +1,20 @@
-from telethon.network.connection import tcpfull
+from telethon.network.connection import connection, tcpfull
 from telethon.network import mtprotosender
 from telethon.client import telegrambaseclient
 
 from .client import telegrambaseclient as telegrambaseclient_patch
 from .network import mtprotosender as mtprotosender_patch
+from .network.connection import connection as connection_patch
 from .network.connection import tcpfull as tcpfull_patch
 
 patched = False
 
 if patched is False:
     tcpfull.FullPacketCodec.read_packet = tcpfull_patch.FullPacketCodec.read_packet
+    tcpfull.FullPacketCodec.encode_packet = tcpfull_patch.FullPacketCodec.encode_packet
+    connection.Connection._proxy_connect = connection_patch.Connection._proxy_connect
     mtprotosender.MTProtoSender._disconnect = mtprotosender_patch.MTProtoSender._disconnect
     mtprotosender.MTProtoSender._handle_ack = mtprotosender_patch.MTProtoSender._handle_ack
     telegrambaseclient.TelegramBaseClient.connect = telegrambaseclient_patch.TelegramBaseClient.connect
+    telegrambaseclient.TelegramBaseClient._disconnect_coro = telegrambaseclient_patch.TelegramBaseClient._disconnect_coro
     patched = True
@@ -1,9 +1,19 @@
 from .client_holds import ClientHoldsStorage
 from .proxies import ProxyStorage, Proxy
+from .tunnels import TunnelPool
+from .rate_limits import RateLimitStorage
+from .rate_pacer import RatePacerStorage
+from .dormant import DormantClientStorage, DormantClient
+from .connections import ConnectionBudgetStorage
 
 
 client_holds_storage = ClientHoldsStorage()
 proxy_storage = ProxyStorage()
+tunnel_pool = TunnelPool(proxy_storage)
+rate_limit_storage = RateLimitStorage()
+rate_pacer_storage = RatePacerStorage()
+dormant_storage = DormantClientStorage()
+connection_budget = ConnectionBudgetStorage()
 
 
-__ALL__ = [client_holds_storage, proxy_storage, Proxy]
+__ALL__ = [client_holds_storage, proxy_storage, tunnel_pool, rate_limit_storage, rate_pacer_storage, dormant_storage, connection_budget, Proxy, DormantClient]
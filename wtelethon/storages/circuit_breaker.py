@@ -0,0 +1,157 @@
+import collections
+from dataclasses import dataclass
+from enum import StrEnum
+from typing import Any, Optional
+
+
+class CircuitState(StrEnum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+@dataclass
+class CircuitBreakerConfig:
+    """Пороги автомата отключения прокси.
+
+    Attributes:
+        failure_threshold: Сколько ошибок за `failure_window` секунд размыкают автомат.
+        failure_window: Окно подсчёта ошибок в секундах.
+        error_cooldown: Пауза после каждой ошибки в замкнутом состоянии.
+        open_timeout: Время первого размыкания в секундах.
+        backoff_factor: Множитель времени размыкания для каждого следующего размыкания подряд.
+        max_open_timeout: Верхняя граница времени размыкания.
+        probe_timeout: Сколько ждать результата пробного подключения в полуоткрытом состоянии,
+            прежде чем пустить следующую пробу.
+    """
+
+    failure_threshold: int = 3
+    failure_window: float = 60 * 3
+    error_cooldown: float = 0.5
+    open_timeout: float = 60 * 3
+    backoff_factor: float = 2.0
+    max_open_timeout: float = 60 * 60
+    probe_timeout: float = 60
+
+
+class CircuitBreaker:
+    """Автомат отключения (circuit breaker) одного прокси.
+
+    CLOSED - прокси выдаётся, ошибки копятся в кольцевом буфере.
+    OPEN - после `failure_threshold` ошибок в окне прокси не выдаётся,
+    время размыкания растёт экспоненциально с каждым размыканием подряд.
+    HALF_OPEN - по истечении размыкания выдаётся ровно одному пробному клиенту:
+    успех замыкает автомат, ошибка снова размыкает его.
+    """
+
+    __slots__ = ("config", "state", "failures", "open_count", "open_until", "probe_started")
+
+    config: CircuitBreakerConfig
+    state: CircuitState
+    failures: collections.deque[float]
+    open_count: int
+    open_until: float
+    probe_started: Optional[float]
+
+    def __init__(self, config: CircuitBreakerConfig):
+        self.config = config
+        self.state = CircuitState.CLOSED
+        self.failures = collections.deque(maxlen=config.failure_threshold)
+        self.open_count = 0
+        self.open_until = 0
+        self.probe_started = None
+
+    def configure(self, config: CircuitBreakerConfig) -> None:
+        """Применяет новые пороги, сохраняя накопленные ошибки."""
+        self.config = config
+        self.failures = collections.deque(self.failures, maxlen=config.failure_threshold)
+
+    def errors(self, now: float) -> list[float]:
+        """Возвращает моменты ошибок, попадающие в текущее окно."""
+        while self.failures and self.failures[0] < now - self.config.failure_window:
+            self.failures.popleft()
+
+        return list(self.failures)
+
+    def available_at(self, now: float) -> float:
+        """Возвращает момент, с которого прокси можно выдавать (0 - можно сейчас)."""
+        if self.state is CircuitState.OPEN:
+            if now < self.open_until:
+                return self.open_until
+
+            self.state = CircuitState.HALF_OPEN
+            self.probe_started = None
+
+        if self.state is CircuitState.HALF_OPEN:
+            if self.probe_started is None:
+                return 0
+
+            return self.probe_started + self.config.probe_timeout
+
+        if not self.failures:
+            return 0
+
+        return self.failures[-1] + self.config.error_cooldown
+
+    def on_acquire(self, now: float) -> None:
+        """Отмечает выдачу прокси; в полуоткрытом состоянии это пробный клиент."""
+        if self.state is CircuitState.HALF_OPEN:
+            self.probe_started = now
+
+    def record_failure(self, now: float) -> None:
+        """Учитывает ошибку и при превышении порога размыкает автомат."""
+        if self.state is CircuitState.HALF_OPEN:
+            self.trip(now)
+            return
+
+        self.failures.append(now)
+        if (
+            self.state is CircuitState.CLOSED
+            and len(self.failures) >= self.config.failure_threshold
+            and self.failures[0] >= now - self.config.failure_window
+        ):
+            self.trip(now)
+
+    def record_success(self) -> None:
+        """Учитывает успешное подключение и замыкает автомат."""
+        if self.state is CircuitState.CLOSED:
+            return
+
+        self.state = CircuitState.CLOSED
+        self.open_count = 0
+        self.open_until = 0
+        self.probe_started = None
+        self.failures.clear()
+
+    def trip(self, now: float, min_timeout: float = 0) -> None:
+        """Размыкает автомат с экспоненциально растущим временем размыкания.
+
+        Args:
+            now: Текущее время.
+            min_timeout: Минимальное время размыкания в секундах.
+        """
+        timeout = min(
+            self.config.open_timeout * self.config.backoff_factor ** self.open_count,
+            self.config.max_open_timeout,
+        )
+        self.state = CircuitState.OPEN
+        self.open_count += 1
+        self.open_until = now + max(timeout, min_timeout)
+        self.probe_started = None
+
+    def export_state(self) -> dict[str, Any]:
+        return {
+            "state": self.state.value,
+            "failures": list(self.failures),
+            "open_count": self.open_count,
+            "open_until": self.open_until,
+            "probe_started": self.probe_started,
+        }
+
+    def restore_state(self, state: dict[str, Any]) -> None:
+        self.state = CircuitState(state.get("state", self.state))
+        self.failures.clear()
+        self.failures.extend(state.get("failures", ()))
+        self.open_count = state.get("open_count", self.open_count)
+        self.open_until = state.get("open_until", self.open_until)
+        self.probe_started = state.get("probe_started")
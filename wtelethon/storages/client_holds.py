@@ -1,60 +1,253 @@
-import contextlib
+import asyncio
 import time
-from typing import TYPE_CHECKING, Optional
+import weakref
+from typing import TYPE_CHECKING, Optional, Union
+
+from telethon.tl.tlobject import TLRequest
 
 from wtelethon.lib.metaclasses.singleton import _SingletonMeta
+from wtelethon.lib.structures import IndexedHeap
 
 
 if TYPE_CHECKING:
     from wtelethon.client import TelegramClient
 
 
+MethodType = Union[str, TLRequest, type[TLRequest]]
+
+
+def _method_name(method: MethodType) -> str:
+    if isinstance(method, str):
+        return method
+
+    return (method if isinstance(method, type) else type(method)).__name__
+
+
 class ClientHoldsStorage(metaclass=_SingletonMeta):
-    """Глобальное хранилище временных блокировок клиентов (singleton)."""
+    """Глобальное хранилище временных блокировок клиентов (singleton).
+
+    Клиенты лежат в min-куче по времени окончания блокировки: добавление,
+    изменение блокировки и поиск свободного клиента занимают O(log n).
+    `wait_free_client` спит ровно до окончания ближайшей блокировки и
+    просыпается раньше, если блокировку сняли или появился новый клиент.
 
-    _holds: dict["TelegramClient", int]
+    Кроме блокировки всего аккаунта, клиента можно заблокировать только для
+    одного метода TL (например, после FloodWait на `SendMessageRequest`):
+    такой клиент выдаётся для других методов, но не для заблокированного.
+
+    Хранилище держит клиентов по слабым ссылкам: клиент, на которого больше
+    нигде нет ссылок, удаляется из хранилища автоматически вместе с сессией,
+    соединением и кэшем сущностей.
+    """
+
+    _holds: IndexedHeap[weakref.ref]
+    _method_holds: weakref.WeakKeyDictionary
+    _dead: list[weakref.ref]
+    _waiters: set[asyncio.Future]
 
     def __init__(self):
-        self._holds = {}
+        self._holds = IndexedHeap()
+        self._method_holds = weakref.WeakKeyDictionary()
+        self._dead = []
+        self._waiters = set()
+
+    @property
+    def live_clients(self) -> int:
+        """Количество живых клиентов в хранилище."""
+        self._purge()
+        return len(self._holds)
 
     def add_client(self, client: "TelegramClient"):
         """Добавляет клиента в хранилище с текущим временем."""
-        self._holds[client] = time.time()
+        self._set_release_time(client, time.time())
 
     def remove_client(self, client: "TelegramClient"):
         """Удаляет клиента из хранилища."""
-        with contextlib.suppress(KeyError):
-            self._holds.pop(client)
+        self._purge()
+        self._holds.remove(weakref.ref(client))
+        self._method_holds.pop(client, None)
 
-    def add_hold(self, client: "TelegramClient", add_hold: int = 60):
+    def add_hold(self, client: "TelegramClient", add_hold: int = 60, method: Optional[MethodType] = None):
         """Добавляет временную блокировку для клиента.
 
         Args:
             client: Клиент для блокировки.
             add_hold: Время блокировки в секундах.
+            method: Если задан, блокируется только этот метод TL (имя класса
+                запроса, сам запрос или его класс), а не весь аккаунт.
+
+        Example:
+            >>> client_holds_storage.add_hold(client, 300, method=functions.messages.SendMessageRequest)
         """
-        self._holds[client] = time.time() + add_hold
+        if method is None:
+            self._set_release_time(client, time.time() + add_hold)
+            return
 
-    def reset_hold(self, client: "TelegramClient"):
-        """Снимает блокировку с клиента.
+        holds = self._method_holds.setdefault(client, {})
+        holds[_method_name(method)] = max(holds.get(_method_name(method), 0), time.time() + add_hold)
+
+    def reset_hold(self, client: "TelegramClient", method: Optional[MethodType] = None):
+        """Снимает блокировку с клиента, клиент сразу становится свободным.
 
         Args:
             client: Клиент для разблокировки.
+            method: Если задан, снимается только блокировка этого метода.
         """
-        with contextlib.suppress(KeyError):
-            self._holds.pop(client)
+        if method is not None:
+            holds = self._method_holds.get(client)
+            if holds and holds.pop(_method_name(method), None) is not None:
+                self._wake_waiters()
+
+        elif weakref.ref(client) in self._holds:
+            self._set_release_time(client, time.time())
 
-    def get_free_client(self) -> Optional["TelegramClient"]:
-        """Возвращает свободный клиент, если время блокировки истекло.
+    def get_hold(self, client: "TelegramClient", method: Optional[MethodType] = None) -> Optional[float]:
+        """Возвращает Unix-время окончания блокировки клиента.
 
         Args:
-            client: Клиент для проверки.
+            client: Клиент.
+            method: Если задан, возвращает время окончания блокировки этого метода.
+
+        Returns:
+            Время окончания блокировки или None, если клиента (блокировки метода) нет.
+        """
+        if method is None:
+            return self._holds.priority(weakref.ref(client))
+
+        return self._method_holds.get(client, {}).get(_method_name(method))
+
+    def get_free_client(self, method: Optional[MethodType] = None) -> Optional["TelegramClient"]:
+        """Возвращает клиента, блокировка которого закончилась раньше всех.
+
+        Args:
+            method: Если задан, пропускает клиентов, заблокированных для этого метода.
 
         Returns:
             Клиент если он свободен, иначе None.
         """
-        for client in self._holds:
-            if self._holds[client] < time.time():
-                return client
+        return self._find_free_client(method, time.time())[0]
+
+    async def wait_free_client(
+        self,
+        timeout: Optional[float] = None,
+        hold: Optional[int] = None,
+        method: Optional[MethodType] = None,
+    ) -> "TelegramClient":
+        """Ожидает свободного клиента.
 
-        return None
+        Args:
+            timeout: Максимальное время ожидания в секундах (None - без ограничения).
+            hold: Если задано, сразу блокирует полученного клиента на `hold` секунд,
+                чтобы другие ожидающие не получили того же клиента.
+            method: Если задан, ожидает клиента, не заблокированного для этого метода.
+
+        Returns:
+            Свободный клиент.
+
+        Raises:
+            asyncio.TimeoutError: Если свободный клиент не появился за `timeout` секунд.
+
+        Example:
+            >>> while True:
+            >>>     client = await client_holds_storage.wait_free_client(hold=300)
+            >>>     await process_client(client)
+        """
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+
+        while True:
+            now = time.time()
+            client, next_release = self._find_free_client(method, now)
+            if client is not None:
+                break
+
+            wait_for = None if next_release is None else max(next_release - now, 0)
+            if deadline is not None:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    raise asyncio.TimeoutError("No client became free in time")
+
+                wait_for = remaining if wait_for is None else min(wait_for, remaining)
+
+            waiter = loop.create_future()
+            self._waiters.add(waiter)
+            try:
+                await asyncio.wait((waiter,), timeout=wait_for)
+            finally:
+                self._waiters.discard(waiter)
+
+        if hold is not None:
+            self.add_hold(client, hold)
+
+        return client
+
+    def _find_free_client(
+        self, method: Optional[MethodType], now: float
+    ) -> tuple[Optional["TelegramClient"], Optional[float]]:
+        """Возвращает (свободный клиент, None) или (None, ближайшее время освобождения)."""
+        self._purge()
+        name = None if method is None else _method_name(method)
+
+        found, next_release, dead = None, None, []
+        for release_time, ref in self._holds.iter_sorted():
+            if release_time >= now:
+                next_release = release_time if next_release is None else min(next_release, release_time)
+                break
+
+            if (client := ref()) is None:
+                # клиент собран сборщиком мусора, но колбэк ещё не отработал
+                dead.append(ref)
+                continue
+
+            method_release = None if name is None else self._method_release(client, name, now)
+            if method_release is None:
+                found = client
+                break
+
+            # клиент свободен, но заблокирован для метода - смотрим следующего
+            next_release = method_release if next_release is None else min(next_release, method_release)
+
+        for ref in dead:
+            self._holds.remove(ref)
+
+        if found is not None:
+            return found, None
+
+        return None, next_release
+
+    def _method_release(self, client: "TelegramClient", name: str, now: float) -> Optional[float]:
+        holds = self._method_holds.get(client)
+        if not holds or (release_time := holds.get(name)) is None:
+            return None
+
+        if release_time < now:
+            del holds[name]
+            return None
+
+        return release_time
+
+    def _on_client_collected(self, ref: weakref.ref) -> None:
+        # колбэк может сработать посреди операции с кучей, поэтому только откладываем удаление
+        self._dead.append(ref)
+
+    def _purge(self) -> None:
+        while self._dead:
+            self._holds.remove(self._dead.pop())
+
+    def _wake_waiters(self) -> None:
+        for waiter in self._waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+
+    def _set_release_time(self, client: "TelegramClient", release_time: float) -> None:
+        self._purge()
+        ref = weakref.ref(client)
+        if ref not in self._holds:
+            ref = weakref.ref(client, self._on_client_collected)
+
+        earliest = self._holds.peek()
+        self._holds.push(ref, release_time)
+
+        # ожидающие спят до прежней ближайшей блокировки - будим, только если она стала раньше
+        if self._waiters and (earliest is None or release_time < earliest[0]):
+            self._wake_waiters()
@@ -0,0 +1,271 @@
+import asyncio
+import collections
+import contextlib
+import time
+import weakref
+from typing import TYPE_CHECKING, Optional
+
+from wtelethon.lib.metaclasses.singleton import _SingletonMeta
+from wtelethon.lib.structures import IndexedHeap
+from wtelethon.storages.metrics import QUEUE_DELAY_BUCKETS, Histogram, render_connection_metrics
+
+
+if TYPE_CHECKING:
+    from wtelethon.client import TelegramClient
+
+
+class ConnectionBudgetStorage(metaclass=_SingletonMeta):
+    """Общий лимит одновременно подключённых клиентов процесса (singleton).
+
+    `connect()` клиента занимает слот бюджета; `disconnect()` его освобождает.
+    Если слотов нет, подключение отбирает слот у клиента, который дольше всех
+    не делал запросов (не меньше `idle_after` секунд и без запросов в работе),
+    и отключает его. Если таких клиентов нет, подключение ждёт в очереди
+    освобождения слота. Отключённый по бюджету клиент переподключается сам при
+    следующем запросе.
+
+    Подключённые клиенты лежат в min-куче по времени последнего запроса, поэтому
+    поиск кандидата на отключение не просматривает весь парк. Время ожидания
+    слота пишется в гистограмму `queue_delay`.
+
+    По умолчанию лимит выключен, включается через `configure`.
+    """
+
+    _max_connected: int
+    _idle_after: float
+    _timeout: Optional[float]
+    _connected: IndexedHeap["TelegramClient"]
+    _in_flight: collections.Counter
+    _evicted: weakref.WeakSet
+    _reconnecting: dict["TelegramClient", asyncio.Task]
+    _evicting: set["TelegramClient"]
+    _waiters: collections.deque[asyncio.Future]
+    queue_delay: Histogram
+    evictions: int
+
+    def __init__(self):
+        self._max_connected = 0
+        self._idle_after = 60.0
+        self._timeout = None
+        self._connected = IndexedHeap()
+        self._in_flight = collections.Counter()
+        self._evicted = weakref.WeakSet()
+        self._reconnecting = {}
+        self._evicting = set()
+        self._waiters = collections.deque()
+        self.queue_delay = Histogram(QUEUE_DELAY_BUCKETS)
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self._max_connected > 0
+
+    @property
+    def max_connected(self) -> int:
+        return self._max_connected
+
+    @property
+    def connected(self) -> int:
+        """Количество клиентов, занимающих слот."""
+        return len(self._connected)
+
+    @property
+    def waiting(self) -> int:
+        """Количество подключений, ожидающих слота."""
+        return sum(not waiter.done() for waiter in self._waiters)
+
+    def configure(self, max_connected: int = 0, idle_after: float = 60.0, timeout: Optional[float] = None):
+        """Включает лимит подключений или меняет его параметры.
+
+        Args:
+            max_connected: Максимум одновременно подключённых клиентов. 0 выключает лимит.
+            idle_after: Сколько секунд клиент без запросов считается простаивающим
+                и может быть отключён ради нового подключения.
+            timeout: Максимальное ожидание слота в `connect()` (None - без ограничения).
+
+        Raises:
+            ValueError: Если параметры некорректны.
+
+        Example:
+            >>> connection_budget.configure(max_connected=500, idle_after=120)
+        """
+        if max_connected < 0 or idle_after < 0:
+            raise ValueError("max_connected and idle_after must not be negative")
+
+        self._max_connected = max_connected
+        self._idle_after = idle_after
+        self._timeout = timeout
+
+        if not max_connected:
+            self._connected.clear()
+            self._in_flight.clear()
+            self._evicted.clear()
+
+        # лимит мог вырасти или выключиться - ожидающие перепроверяют слоты
+        for waiter in self._waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+
+    def render_metrics(self) -> str:
+        """Возвращает метрики бюджета в текстовом формате Prometheus.
+
+        Example:
+            >>> print(connection_budget.render_metrics())
+        """
+        return render_connection_metrics(
+            self.connected, self.waiting, self._max_connected, self.evictions, self.queue_delay
+        )
+
+    async def acquire(self, client: "TelegramClient") -> None:
+        """Занимает слот для подключения клиента, при необходимости отключая простаивающего.
+
+        Raises:
+            asyncio.TimeoutError: Если слот не освободился за `timeout` секунд.
+        """
+        if not self.enabled or client in self._connected:
+            return
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        deadline = None if self._timeout is None else started + self._timeout
+        waiter = None
+
+        try:
+            while self.enabled:
+                # пока есть очередь, новые подключения встают в её конец
+                if waiter is not None or not self._waiters:
+                    if len(self._connected) < self._max_connected:
+                        break
+
+                    victim, next_idle = self._find_idle(time.monotonic())
+                    if victim is not None:
+                        await self._evict(victim, client)
+                        self.queue_delay.observe(loop.time() - started)
+                        return
+
+                else:
+                    next_idle = None
+
+                first_try = waiter is None
+                waiter = loop.create_future()
+                if first_try:
+                    self._waiters.append(waiter)
+                else:
+                    self._waiters.appendleft(waiter)
+
+                wait_for = None if next_idle is None else max(next_idle - time.monotonic(), 0)
+                if deadline is not None:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        raise asyncio.TimeoutError("No connection slot became free in time")
+
+                    wait_for = remaining if wait_for is None else min(wait_for, remaining)
+
+                await asyncio.wait((waiter,), timeout=wait_for)
+
+                with contextlib.suppress(ValueError):
+                    self._waiters.remove(waiter)
+
+        except BaseException:
+            if waiter is not None:
+                try:
+                    self._waiters.remove(waiter)
+                except ValueError:
+                    # ожидающий уже получил сигнал - не теряем его, передаём следующему
+                    self._wake_waiter()
+
+            raise
+
+        if self.enabled:
+            self._connected.push(client, time.monotonic())
+
+        self.queue_delay.observe(loop.time() - started)
+        self._wake_waiter()
+
+    def is_evicting(self, client: "TelegramClient") -> bool:
+        """True, пока клиент отключается бюджетом (его аренда прокси должна сохраниться)."""
+        return client in self._evicting
+
+    def release(self, client: "TelegramClient") -> None:
+        """Освобождает слот клиента и будит следующего ожидающего."""
+        self._in_flight.pop(client, None)
+        if self._connected.remove(client):
+            self._wake_waiter()
+
+    async def begin_call(self, client: "TelegramClient") -> None:
+        """Отмечает начало запроса клиента; отключённого по бюджету клиента переподключает.
+
+        Raises:
+            ConnectionError: Если отключённый по бюджету клиент не смог переподключиться.
+        """
+        if client in self._evicted and not client.is_connected():
+            # параллельные запросы ждут одного переподключения
+            task = self._reconnecting.get(client)
+            if task is None:
+                task = self._reconnecting[client] = asyncio.get_running_loop().create_task(self._reconnect(client))
+
+            await asyncio.shield(task)
+
+        self._in_flight[client] += 1
+        if client in self._connected:
+            self._connected.update(client, time.monotonic())
+
+    def end_call(self, client: "TelegramClient") -> None:
+        """Отмечает окончание запроса клиента."""
+        self._in_flight[client] -= 1
+        if self._in_flight[client] > 0:
+            return
+
+        del self._in_flight[client]
+        if client in self._connected:
+            self._connected.update(client, time.monotonic())
+
+            # клиент стал кандидатом на отключение - ожидающий пересчитает время сна
+            self._wake_waiter()
+
+    def _find_idle(self, now: float) -> tuple[Optional["TelegramClient"], Optional[float]]:
+        """Возвращает (клиент для отключения, None) или (None, когда появится кандидат)."""
+        for last_used, client in self._connected.iter_sorted():
+            if last_used > now - self._idle_after:
+                return None, last_used + self._idle_after
+
+            if not self._in_flight[client]:
+                return client, None
+
+        return None, None
+
+    async def _reconnect(self, client: "TelegramClient") -> None:
+        try:
+            await client.connect()
+        finally:
+            self._reconnecting.pop(client, None)
+
+        # ошибки подключения уходят в handle_exception, и connect() может вернуться без
+        # подключения - тогда клиент остаётся отключённым по бюджету до следующей попытки
+        if not client.is_connected():
+            raise ConnectionError("Client evicted by the connection budget failed to reconnect")
+
+        self._evicted.discard(client)
+
+    async def _evict(self, victim: "TelegramClient", client: "TelegramClient") -> None:
+        # слот передаётся сразу, чтобы его не занял другой ожидающий, пока жертва отключается
+        self._connected.remove(victim)
+        self._connected.push(client, time.monotonic())
+        self._evicted.add(victim)
+        self.evictions += 1
+
+        # аренда прокси остаётся за клиентом: он переподключится через тот же прокси,
+        # и лимит `max_per_proxy` не будет превышен
+        self._evicting.add(victim)
+        try:
+            with contextlib.suppress(Exception):
+                await victim.disconnect()
+        finally:
+            self._evicting.discard(victim)
+
+    def _wake_waiter(self) -> None:
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
@@ -0,0 +1,347 @@
+import asyncio
+import contextlib
+import os
+import time
+from typing import TYPE_CHECKING, Any, AsyncIterator, Optional
+
+from wtelethon.lib.metaclasses.singleton import _SingletonMeta
+from wtelethon.lib.structures import IndexedHeap
+
+
+if TYPE_CHECKING:
+    from wtelethon.attachments import MemoryAttachment
+    from wtelethon.client import TelegramClient
+
+
+class DormantClient:
+    """Лёгкое описание аккаунта, из которого по требованию создаётся клиент.
+
+    Хранит только DC, ключ авторизации, `MemoryAttachment` и путь к JSON -
+    без MTProto-отправителя, буферов обновлений и кэша сущностей полноценного
+    `TelegramClient`. Клиент создаётся при `materialize`/`use` и закрывается
+    хранилищем `dormant_storage` после `idle_timeout` секунд без использования;
+    изменения памяти и ключа авторизации при этом сохраняются в описании.
+
+    Example:
+        >>> dormant = await DormantClient.from_files("./accounts/1.session", "./accounts/1.json")
+        >>> async with dormant.use() as client:
+        >>>     await client.connect()
+        >>>     await client.get_me()
+    """
+
+    __slots__ = (
+        "dc_id",
+        "auth_key",
+        "memory",
+        "json_path",
+        "idle_timeout",
+        "client_kwargs",
+        "_client",
+        "_users",
+        "_lock",
+    )
+
+    dc_id: int
+    auth_key: Optional[bytes]
+    memory: "MemoryAttachment"
+    json_path: Optional[str]
+    idle_timeout: float
+    client_kwargs: dict[str, Any]
+
+    def __init__(
+        self,
+        dc_id: int,
+        auth_key: Optional[bytes],
+        memory: Optional["MemoryAttachment"] = None,
+        json_path: Optional[str] = None,
+        idle_timeout: float = 300,
+        **client_kwargs,
+    ):
+        if idle_timeout <= 0:
+            raise ValueError("idle_timeout must be greater than 0")
+
+        if memory is None:
+            from wtelethon.attachments import MemoryAttachment
+
+            memory = MemoryAttachment()
+
+        self.dc_id = dc_id
+        self.auth_key = auth_key
+        self.memory = memory
+        self.json_path = json_path
+        self.idle_timeout = idle_timeout
+        self.client_kwargs = client_kwargs
+        self._client = None
+        self._users = 0
+        self._lock = None
+
+    def __repr__(self) -> str:
+        state = "materialized" if self._client is not None else "dormant"
+        return f"DormantClient(dc_id={self.dc_id}, phone={self.memory.phone}, {state})"
+
+    @property
+    def client(self) -> Optional["TelegramClient"]:
+        """Созданный клиент или None, если описание сейчас не материализовано."""
+        return self._client
+
+    @property
+    def session_path(self) -> Optional[str]:
+        if not self.memory.session_file:
+            return None
+
+        return os.path.join(self.memory.source_dir or "", self.memory.session_file)
+
+    @classmethod
+    async def from_files(
+        cls,
+        session_path: str,
+        json_path: Optional[str] = None,
+        idle_timeout: float = 300,
+        **client_kwargs,
+    ) -> "DormantClient":
+        """Создаёт описание из .session и JSON файлов, читая их в пуле потоков.
+
+        Args:
+            session_path: Путь к .session файлу.
+            json_path: Путь к JSON файлу аккаунта.
+            idle_timeout: Через сколько секунд без использования клиент закрывается.
+            **client_kwargs: Параметры конструктора клиента для материализации.
+
+        Returns:
+            Описание в неактивном состоянии.
+        """
+        return await asyncio.to_thread(cls._sync_from_files, session_path, json_path, idle_timeout, client_kwargs)
+
+    @classmethod
+    def _sync_from_files(
+        cls,
+        session_path: str,
+        json_path: Optional[str],
+        idle_timeout: float,
+        client_kwargs: dict[str, Any],
+    ) -> "DormantClient":
+        from wtelethon.attachments import JsonAttachment, MemoryAttachment
+        from wtelethon.client import TelegramClient
+
+        session = TelegramClient._sync_read_sqlite_session(session_path)
+        memory = MemoryAttachment()
+        if json_path:
+            json_attachment = JsonAttachment(json_path)
+            json_attachment._sync_load()
+            json_attachment.fill_memory(memory)
+
+        memory.source_dir = os.path.dirname(session_path)
+        memory.session_file = os.path.basename(session_path)
+
+        return cls(
+            session.dc_id,
+            session.auth_key.key if session.auth_key else None,
+            memory,
+            json_path,
+            idle_timeout,
+            **client_kwargs,
+        )
+
+    @classmethod
+    def from_client(cls, client: "TelegramClient", idle_timeout: float = 300) -> "DormantClient":
+        """Оборачивает уже созданного клиента: описание сразу материализовано.
+
+        Клиент будет закрыт и отпущен после `idle_timeout` секунд без использования.
+        Параметры конструктора клиента сохраняются для повторной материализации.
+        Вызывается внутри запущенного event loop.
+        """
+        dormant = cls(
+            client.session.dc_id,
+            None,
+            client.memory,
+            client.json.file_path if client.json else None,
+            idle_timeout,
+            **{key: value for key, value in client.__kwargs__.items() if key != "session"},
+        )
+        dormant._capture(client)
+        dormant._client = client
+        DormantClientStorage()._on_materialized(dormant)
+        DormantClientStorage()._schedule_idle(dormant)
+        return dormant
+
+    async def materialize(self) -> "TelegramClient":
+        """Возвращает клиента, создавая его при необходимости.
+
+        Клиент, полученный без `use`, закрывается по `idle_timeout`, отсчитанному
+        от последнего вызова `materialize`.
+
+        Returns:
+            Клиент (не подключённый, если создан заново).
+        """
+        async with self._get_lock():
+            if self._client is None:
+                self._client = await self._build_client()
+                DormantClientStorage()._on_materialized(self)
+
+            client = self._client
+
+        if self._users == 0:
+            DormantClientStorage()._schedule_idle(self)
+
+        return client
+
+    @contextlib.asynccontextmanager
+    async def use(self) -> AsyncIterator["TelegramClient"]:
+        """Выдаёт клиента и не даёт закрыть его по таймауту, пока блок не завершён.
+
+        Example:
+            >>> async with dormant.use() as client:
+            >>>     await client.connect()
+            >>>     await client.send_message("me", "hi")
+        """
+        self._users += 1
+        DormantClientStorage()._cancel_idle(self)
+        try:
+            client = await self.materialize()
+            yield client
+        finally:
+            self._users -= 1
+            if self._users == 0 and self._client is not None:
+                DormantClientStorage()._schedule_idle(self)
+
+    async def dematerialize(self) -> bool:
+        """Сохраняет состояние клиента в описание, отключает и отпускает клиента.
+
+        Returns:
+            True если клиент был материализован.
+        """
+        async with self._get_lock():
+            client = self._client
+            if client is None:
+                return False
+
+            self._capture(client)
+            self._client = None
+            DormantClientStorage()._on_dematerialized(self)
+
+        await client.disconnect()
+        return True
+
+    def _get_lock(self) -> asyncio.Lock:
+        # замок создаётся при первой материализации: описания, которые ещё не
+        # использовались, его не держат
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        return self._lock
+
+    def _capture(self, client: "TelegramClient") -> None:
+        self.memory = client.memory
+        self.dc_id = client.session.dc_id
+        self.auth_key = client.session.auth_key.key if client.session.auth_key else None
+
+    async def _build_client(self) -> "TelegramClient":
+        from telethon.crypto import AuthKey
+        from telethon.sessions import StringSession
+
+        from wtelethon.client import TelegramClient
+        from wtelethon.lib.utils import get_dc_address
+
+        session = StringSession()
+        session.set_dc(self.dc_id, get_dc_address(self.dc_id), 443)
+        if self.auth_key is not None:
+            session.auth_key = AuthKey(self.auth_key)
+
+        return await TelegramClient.create(
+            session,
+            json_path=self.json_path,
+            memory_attachment=self.memory,
+            **self.client_kwargs,
+        )
+
+
+class DormantClientStorage(metaclass=_SingletonMeta):
+    """Закрывает материализованные `DormantClient` после простоя (singleton).
+
+    Свободные материализованные описания лежат в min-куче по моменту
+    закрытия; фоновая задача спит до ближайшего момента и закрывает
+    клиентов пачкой. Описания, выданные через `use`, в куче не лежат.
+    """
+
+    _idle: IndexedHeap[DormantClient]
+    _materialized: int
+    _sweeper: Optional[asyncio.Task]
+    _wakeup: Optional[asyncio.Future]
+
+    def __init__(self):
+        self._idle = IndexedHeap()
+        self._materialized = 0
+        self._sweeper = None
+        self._wakeup = None
+
+    @property
+    def materialized(self) -> int:
+        """Количество описаний с созданным клиентом."""
+        return self._materialized
+
+    @property
+    def idle(self) -> int:
+        """Количество материализованных описаний, ожидающих закрытия по простою."""
+        return len(self._idle)
+
+    async def dematerialize_idle(self, now: Optional[float] = None) -> int:
+        """Закрывает клиентов, чей простой истёк к моменту `now`.
+
+        Returns:
+            Количество закрытых клиентов.
+        """
+        now = time.monotonic() if now is None else now
+
+        expired = []
+        while (earliest := self._idle.peek()) is not None and earliest[0] <= now:
+            expired.append(self._idle.pop()[1])
+
+        results = await asyncio.gather(*(self._expire(dormant) for dormant in expired), return_exceptions=True)
+        return sum(result is True for result in results)
+
+    async def dematerialize_all(self) -> int:
+        """Закрывает всех ожидающих клиентов независимо от простоя, например при остановке.
+
+        Returns:
+            Количество закрытых клиентов.
+        """
+        return await self.dematerialize_idle(float("inf"))
+
+    async def _expire(self, dormant: DormantClient) -> bool:
+        # между снятием с кучи и запуском задачи клиента могли снова взять в работу
+        if dormant._users or dormant in self._idle:
+            return False
+
+        return await dormant.dematerialize()
+
+    def _on_materialized(self, dormant: DormantClient) -> None:
+        self._materialized += 1
+
+    def _on_dematerialized(self, dormant: DormantClient) -> None:
+        self._materialized -= 1
+        self._idle.remove(dormant)
+
+    def _schedule_idle(self, dormant: DormantClient) -> None:
+        deadline = time.monotonic() + dormant.idle_timeout
+        earliest = self._idle.peek()
+        self._idle.push(dormant, deadline)
+
+        if self._sweeper is None or self._sweeper.done():
+            self._sweeper = asyncio.get_running_loop().create_task(self._sweep())
+
+        # фоновая задача спит до прежнего ближайшего момента - будим, только если он стал раньше
+        elif (earliest is None or deadline < earliest[0]) and self._wakeup is not None and not self._wakeup.done():
+            self._wakeup.set_result(None)
+
+    def _cancel_idle(self, dormant: DormantClient) -> None:
+        self._idle.remove(dormant)
+
+    async def _sweep(self) -> None:
+        loop = asyncio.get_running_loop()
+        while (earliest := self._idle.peek()) is not None:
+            self._wakeup = loop.create_future()
+            await asyncio.wait((self._wakeup,), timeout=max(earliest[0] - time.monotonic(), 0))
+            self._wakeup = None
+
+            with contextlib.suppress(Exception):
+                await self.dematerialize_idle()
@@ -0,0 +1,203 @@
+import bisect
+import hashlib
+from typing import TYPE_CHECKING, Iterable, Optional
+
+
+if TYPE_CHECKING:
+    from wtelethon.storages.proxies import Proxy
+
+
+CONNECT_LATENCY_BUCKETS: tuple[float, ...] = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+QUEUE_DELAY_BUCKETS: tuple[float, ...] = (0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0)
+
+_METRIC_PREFIX = "wtelethon_proxy"
+_CONNECTIONS_PREFIX = "wtelethon_connections"
+
+
+class Histogram:
+    """Гистограмма с фиксированными границами корзин в формате Prometheus."""
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    buckets: tuple[float, ...]
+    counts: list[int]
+    sum: float
+    count: int
+
+    def __init__(self, buckets: tuple[float, ...] = CONNECT_LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> Iterable[tuple[str, int]]:
+        """Возвращает пары (le, накопленное количество), включая "+Inf"."""
+        total = 0
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            yield repr(float(bound)), total
+
+        yield "+Inf", self.count
+
+
+class ProxyMetrics:
+    """Счётчики и гистограммы одного прокси.
+
+    Attributes:
+        acquisitions: Сколько раз прокси выдан из хранилища.
+        connect_successes: Успешные подключения через прокси.
+        connect_failures: Неудачные подключения через прокси.
+        connect_latency: Гистограмма времени подключения в секундах.
+        bytes_sent: Отправлено байт через прокси.
+        bytes_received: Получено байт через прокси.
+    """
+
+    __slots__ = (
+        "acquisitions",
+        "connect_successes",
+        "connect_failures",
+        "connect_latency",
+        "bytes_sent",
+        "bytes_received",
+    )
+
+    acquisitions: int
+    connect_successes: int
+    connect_failures: int
+    connect_latency: Histogram
+    bytes_sent: int
+    bytes_received: int
+
+    def __init__(self):
+        self.acquisitions = 0
+        self.connect_successes = 0
+        self.connect_failures = 0
+        self.connect_latency = Histogram()
+        self.bytes_sent = 0
+        self.bytes_received = 0
+
+    @property
+    def used(self) -> bool:
+        """True, если у прокси есть хоть одно событие."""
+        return bool(self.acquisitions or self.connect_successes or self.connect_failures)
+
+    def observe_connect(self, latency: Optional[float]) -> None:
+        """Учитывает подключение: время в секундах или None для неудачного."""
+        if latency is None:
+            self.connect_failures += 1
+            return
+
+        self.connect_successes += 1
+        self.connect_latency.observe(latency)
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _proxy_id(proxy: "Proxy") -> str:
+    """Стабильный идентификатор прокси без учётных данных: короткий хеш канонического вида."""
+    return hashlib.sha256(proxy.canonical_source.encode()).hexdigest()[:12]
+
+
+def _proxy_label(proxy: "Proxy") -> str:
+    # без логина и пароля, чтобы учётные данные не попадали в систему мониторинга;
+    # `id` различает прокси одного шлюза с разными логинами
+    address = _escape_label(f"{proxy.network_type.lower()}://{proxy.host}:{proxy.port}")
+    return f'proxy="{address}",id="{_proxy_id(proxy)}"'
+
+
+_COUNTERS: tuple[tuple[str, str, str], ...] = (
+    ("acquisitions_total", "acquisitions", "Proxy acquisitions from the storage."),
+    ("connect_successes_total", "connect_successes", "Successful connections through the proxy."),
+    ("connect_failures_total", "connect_failures", "Failed connections through the proxy."),
+    ("sent_bytes_total", "bytes_sent", "Bytes sent through the proxy."),
+    ("received_bytes_total", "bytes_received", "Bytes received through the proxy."),
+)
+
+
+def render_prometheus(proxies: Iterable["Proxy"], include_idle: bool = False) -> str:
+    """Формирует метрики прокси в текстовом формате Prometheus (версия 0.0.4).
+
+    Метка `proxy` содержит `scheme://host:port` без учётных данных, метка `id` -
+    короткий хеш канонического вида прокси, чтобы прокси одного шлюза с разными
+    логинами давали разные ряды.
+
+    Args:
+        proxies: Прокси для вывода.
+        include_idle: Если False, прокси без событий и аренд пропускаются,
+            чтобы большие пулы не раздували вывод.
+
+    Returns:
+        Текст метрик.
+    """
+    proxies = [
+        (proxy, _proxy_label(proxy))
+        for proxy in proxies
+        if include_idle or proxy.metrics.used or proxy.leases
+    ]
+
+    lines = []
+    for name, attribute, description in _COUNTERS:
+        lines.append(f"# HELP {_METRIC_PREFIX}_{name} {description}")
+        lines.append(f"# TYPE {_METRIC_PREFIX}_{name} counter")
+        for proxy, label in proxies:
+            lines.append(f"{_METRIC_PREFIX}_{name}{{{label}}} {getattr(proxy.metrics, attribute)}")
+
+    lines.append(f"# HELP {_METRIC_PREFIX}_leases Clients currently leasing the proxy.")
+    lines.append(f"# TYPE {_METRIC_PREFIX}_leases gauge")
+    for proxy, label in proxies:
+        lines.append(f"{_METRIC_PREFIX}_leases{{{label}}} {proxy.leases}")
+
+    lines.append(f"# HELP {_METRIC_PREFIX}_circuit_open Whether the proxy circuit breaker is not closed.")
+    lines.append(f"# TYPE {_METRIC_PREFIX}_circuit_open gauge")
+    for proxy, label in proxies:
+        lines.append(f"{_METRIC_PREFIX}_circuit_open{{{label}}} {int(proxy.breaker.state != 'closed')}")
+
+    lines.append(f"# HELP {_METRIC_PREFIX}_connect_seconds Connection latency through the proxy.")
+    lines.append(f"# TYPE {_METRIC_PREFIX}_connect_seconds histogram")
+    for proxy, label in proxies:
+        histogram = proxy.metrics.connect_latency
+        for le, count in histogram.cumulative():
+            lines.append(f'{_METRIC_PREFIX}_connect_seconds_bucket{{{label},le="{le}"}} {count}')
+
+        lines.append(f"{_METRIC_PREFIX}_connect_seconds_sum{{{label}}} {histogram.sum}")
+        lines.append(f"{_METRIC_PREFIX}_connect_seconds_count{{{label}}} {histogram.count}")
+
+    lines.append("")
+    return "\n".join(lines)
+
+
+def render_connection_metrics(
+    connected: int, waiting: int, max_connected: int, evictions: int, queue_delay: Histogram
+) -> str:
+    """Формирует метрики бюджета подключений в текстовом формате Prometheus (версия 0.0.4)."""
+    lines = [
+        f"# HELP {_CONNECTIONS_PREFIX}_connected Clients holding a connection slot.",
+        f"# TYPE {_CONNECTIONS_PREFIX}_connected gauge",
+        f"{_CONNECTIONS_PREFIX}_connected {connected}",
+        f"# HELP {_CONNECTIONS_PREFIX}_max Connection budget, 0 when disabled.",
+        f"# TYPE {_CONNECTIONS_PREFIX}_max gauge",
+        f"{_CONNECTIONS_PREFIX}_max {max_connected}",
+        f"# HELP {_CONNECTIONS_PREFIX}_waiting Connections waiting for a slot.",
+        f"# TYPE {_CONNECTIONS_PREFIX}_waiting gauge",
+        f"{_CONNECTIONS_PREFIX}_waiting {waiting}",
+        f"# HELP {_CONNECTIONS_PREFIX}_evictions_total Idle clients disconnected to free a slot.",
+        f"# TYPE {_CONNECTIONS_PREFIX}_evictions_total counter",
+        f"{_CONNECTIONS_PREFIX}_evictions_total {evictions}",
+        f"# HELP {_CONNECTIONS_PREFIX}_queue_seconds Time connect() waited for a slot.",
+        f"# TYPE {_CONNECTIONS_PREFIX}_queue_seconds histogram",
+    ]
+    for le, count in queue_delay.cumulative():
+        lines.append(f'{_CONNECTIONS_PREFIX}_queue_seconds_bucket{{le="{le}"}} {count}')
+
+    lines.append(f"{_CONNECTIONS_PREFIX}_queue_seconds_sum {queue_delay.sum}")
+    lines.append(f"{_CONNECTIONS_PREFIX}_queue_seconds_count {queue_delay.count}")
+    lines.append("")
+    return "\n".join(lines)
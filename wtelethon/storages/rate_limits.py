@@ -0,0 +1,131 @@
+from typing import TYPE_CHECKING, Optional
+
+from telethon.tl.tlobject import TLRequest
+
+from wtelethon.lib.metaclasses.singleton import _SingletonMeta
+from wtelethon.lib.structures import TokenBucket
+from wtelethon.storages.client_holds import MethodType, _method_name
+
+
+if TYPE_CHECKING:
+    from wtelethon.client import TelegramClient
+
+
+RateRule = tuple[float, float]
+
+
+def make_rate_rule(limit: int, per: float = 1.0, burst: Optional[int] = None) -> RateRule:
+    """Возвращает правило (скорость в токенах в секунду, ёмкость корзины).
+
+    Raises:
+        ValueError: Если параметры некорректны.
+    """
+    if limit <= 0 or per <= 0:
+        raise ValueError("limit and per must be greater than 0")
+
+    burst = limit if burst is None else burst
+    if burst < 1:
+        raise ValueError("burst must be at least 1")
+
+    return limit / per, float(burst)
+
+
+class RateLimitStorage(metaclass=_SingletonMeta):
+    """Глобальные ограничения частоты запросов по методам TL (singleton).
+
+    Ограничение задаётся корзиной токенов на каждый метод (класс запроса):
+    для каждого клиента своя корзина, а для методов с общим лимитом
+    (`fleet=True`) - одна корзина на все клиенты процесса. Запрос, для
+    которого нет токена, ждёт его в `InternalTools._call` вместо того,
+    чтобы получить FloodWait.
+
+    Проверка идёт по имени класса запроса и не создаёт объектов: корзины
+    клиента создаются один раз на метод и хранятся в самом клиенте.
+    """
+
+    _client_rules: dict[str, RateRule]
+    _fleet_buckets: dict[str, TokenBucket]
+
+    def __init__(self):
+        self._client_rules = {}
+        self._fleet_buckets = {}
+
+    def set_limit(
+        self,
+        method: MethodType,
+        limit: Optional[int],
+        per: float = 1.0,
+        burst: Optional[int] = None,
+        fleet: bool = False,
+    ):
+        """Задаёт ограничение частоты запросов метода.
+
+        Args:
+            method: Метод TL - имя класса запроса, запрос или его класс.
+            limit: Сколько запросов разрешено за `per` секунд. None снимает ограничение.
+            per: Период в секундах.
+            burst: Сколько запросов можно сделать подряд без ожидания. По умолчанию `limit`.
+            fleet: Если True, лимит общий для всех клиентов процесса,
+                иначе действует на каждый клиент отдельно.
+
+        Raises:
+            ValueError: Если параметры некорректны.
+
+        Example:
+            >>> # каждый аккаунт - не чаще 5 раз в минуту, все вместе - 100 в минуту
+            >>> rate_limit_storage.set_limit(functions.contacts.ResolveUsernameRequest, 5, per=60)
+            >>> rate_limit_storage.set_limit("ResolveUsernameRequest", 100, per=60, fleet=True)
+        """
+        name = _method_name(method)
+        rules = self._fleet_buckets if fleet else self._client_rules
+
+        if limit is None:
+            rules.pop(name, None)
+            return
+
+        rule = make_rate_rule(limit, per, burst)
+        if not fleet:
+            self._client_rules[name] = rule
+        elif (bucket := self._fleet_buckets.get(name)) is None:
+            self._fleet_buckets[name] = TokenBucket(*rule)
+        else:
+            bucket.configure(*rule)
+
+    def get_limit(self, method: MethodType, fleet: bool = False) -> Optional[RateRule]:
+        """Возвращает правило метода (токенов в секунду, ёмкость) или None."""
+        name = _method_name(method)
+        if not fleet:
+            return self._client_rules.get(name)
+
+        bucket = self._fleet_buckets.get(name)
+        return None if bucket is None else (bucket.rate, bucket.capacity)
+
+    def reserve(self, client: "TelegramClient", request: TLRequest) -> float:
+        """Резервирует токены для запроса клиента.
+
+        Returns:
+            Сколько секунд нужно подождать перед отправкой запроса (0 - сразу).
+        """
+        name = type(request).__name__
+        rules = client._rate_limit_rules
+        rule = rules.get(name) if rules else None
+        if rule is None:
+            rule = self._client_rules.get(name)
+
+        delay = 0.0
+        if rule is not None:
+            buckets = client._rate_limit_buckets
+            if buckets is None:
+                buckets = client._rate_limit_buckets = {}
+
+            if (bucket := buckets.get(name)) is None:
+                bucket = buckets[name] = TokenBucket(*rule)
+            elif bucket.rate != rule[0] or bucket.capacity != rule[1]:
+                bucket.configure(*rule)
+
+            delay = bucket.reserve()
+
+        if (fleet_bucket := self._fleet_buckets.get(name)) is not None:
+            delay = max(delay, fleet_bucket.reserve())
+
+        return delay
@@ -0,0 +1,114 @@
+import asyncio
+import datetime
+import json
+import os
+from typing import Optional
+
+from wtelethon.lib.metaclasses.singleton import _SingletonMeta
+
+
+# верхние границы возраста аккаунта в днях и метки групп
+_AGE_BUCKETS: tuple[tuple[int, str], ...] = ((7, "7d"), (30, "30d"), (180, "180d"), (365, "1y"))
+_SEED_EWMA_ALPHA: float = 0.2
+
+
+def account_age_bucket(created: Optional[datetime.datetime]) -> str:
+    """Возвращает группу возраста аккаунта: "7d", "30d", "180d", "1y", "old" или "unknown".
+
+    Args:
+        created: Дата создания аккаунта (`MemoryAttachment.session_created_date`).
+    """
+    if created is None:
+        return "unknown"
+
+    now = datetime.datetime.now(created.tzinfo)
+    days = (now - created).days
+    for limit, bucket in _AGE_BUCKETS:
+        if days < limit:
+            return bucket
+
+    return "old"
+
+
+class MethodPace:
+    """Изученная безопасная частота одного метода TL у одного клиента (запросов в минуту)."""
+
+    __slots__ = ("rate", "successes")
+
+    rate: float
+    successes: int
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        self.successes = 0
+
+
+class RatePacerStorage(metaclass=_SingletonMeta):
+    """Изученные частоты методов TL по группам возраста аккаунта (singleton).
+
+    Клиенты с включённым `enable_rate_learning` сообщают сюда свои изученные
+    частоты; новый аккаунт без собственной истории начинает со сглаженной
+    частоты своей группы возраста, а не с заданной вручную.
+    """
+
+    _seeds: dict[str, dict[str, float]]
+
+    def __init__(self):
+        self._seeds = {}
+
+    def seed(self, method: str, age_bucket: str) -> Optional[float]:
+        """Возвращает стартовую частоту метода для группы возраста или None."""
+        return self._seeds.get(age_bucket, {}).get(method)
+
+    def learn(self, method: str, age_bucket: str, rate: float) -> None:
+        """Учитывает изученную клиентом частоту метода.
+
+        Снижение применяется сразу, рост - с экспоненциальным сглаживанием,
+        чтобы один удачливый аккаунт не завысил стартовую частоту группы.
+        """
+        seeds = self._seeds.setdefault(age_bucket, {})
+        previous = seeds.get(method)
+        if previous is None or rate < previous:
+            seeds[method] = rate
+        else:
+            seeds[method] = previous + _SEED_EWMA_ALPHA * (rate - previous)
+
+    def export_state(self) -> dict[str, dict[str, float]]:
+        """Возвращает изученные частоты: {группа возраста: {метод: запросов в минуту}}."""
+        return {age_bucket: dict(seeds) for age_bucket, seeds in self._seeds.items()}
+
+    def restore_state(self, state: dict[str, dict[str, float]]) -> None:
+        """Восстанавливает частоты, сохранённые `export_state`."""
+        for age_bucket, seeds in state.items():
+            self._seeds.setdefault(age_bucket, {}).update(seeds)
+
+    def _sync_save_state(self, path: str, state: dict[str, dict[str, float]]) -> None:
+        with open(path, mode="w", encoding="utf-8") as file:
+            json.dump(state, file, indent=2)
+
+    def _sync_read_state(self, path: str) -> dict[str, dict[str, float]]:
+        with open(path, mode="r", encoding="utf-8") as file:
+            return json.load(file)
+
+    async def save_state(self, path: str) -> None:
+        """Сохраняет изученные частоты в JSON файл.
+
+        Example:
+            >>> await rate_pacer_storage.save_state("./data/rates.json")
+        """
+        await asyncio.to_thread(self._sync_save_state, path, self.export_state())
+
+    async def load_state(self, path: str) -> bool:
+        """Загружает изученные частоты из JSON файла.
+
+        Returns:
+            False, если файла нет.
+
+        Example:
+            >>> await rate_pacer_storage.load_state("./data/rates.json")
+        """
+        if not await asyncio.to_thread(os.path.exists, path):
+            return False
+
+        self.restore_state(await asyncio.to_thread(self._sync_read_state, path))
+        return True
@@ -0,0 +1,416 @@
+import atexit
+import collections
+import contextlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Iterable, Iterator, Optional
+
+from wtelethon.storages.circuit_breaker import CircuitBreaker, CircuitBreakerConfig
+
+
+_SQLITE_MAX_PARAMS: int = 500
+_SQLITE_BUSY_TIMEOUT: float = 5.0
+_SQLITE_CLAIM_TIMEOUT: float = 0.02
+_FLUSH_RETRY_DELAY: float = 1.0
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS proxy_shared (
+        source TEXT PRIMARY KEY,
+        last_used REAL NOT NULL,
+        breaker TEXT NOT NULL,
+        version INTEGER NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS proxy_shared_version ON proxy_shared (version)",
+    """
+    CREATE TABLE IF NOT EXISTS proxy_shared_leases (
+        source TEXT NOT NULL,
+        owner TEXT NOT NULL,
+        pid INTEGER NOT NULL,
+        count INTEGER NOT NULL,
+        PRIMARY KEY (source, owner)
+    )
+    """,
+)
+
+
+def _dumps(state: dict[str, Any]) -> str:
+    return json.dumps(state, separators=(",", ":"))
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+
+    return True
+
+
+class SharedProxyState:
+    """Общее для нескольких процессов состояние прокси в SQLite файле (режим WAL).
+
+    Хранит время последнего использования, состояние автомата отключения
+    и аренды каждого прокси. Чтение изменений не блокирует другие процессы
+    (WAL). Синхронно, в вызывающем потоке, пишутся только проверки при выдаче
+    прокси (`claim`, `acquire_lease`): это одна короткая транзакция
+    `BEGIN IMMEDIATE`, которая ждёт блокировку файла не дольше
+    `_SQLITE_CLAIM_TIMEOUT` секунд, поэтому не может надолго остановить event
+    loop. События автоматов отключения и снятие аренд копятся в очереди и
+    записываются фоновым потоком пачками, одной транзакцией на пачку.
+
+    У каждой строки есть номер версии из общего счётчика, поэтому процесс
+    забирает только изменения, появившиеся после его последней синхронизации.
+    """
+
+    path: str
+    owner: str
+
+    _connection: sqlite3.Connection
+    _writer: sqlite3.Connection
+    _writer_lock: threading.Lock
+    _pending: collections.deque[tuple]
+    _pending_sources: collections.Counter
+    _pending_lock: threading.Lock
+    _wakeup: threading.Event
+    _closed: bool
+    _flusher: threading.Thread
+
+    def __init__(self, path: str):
+        self.path = path
+        self.owner = uuid.uuid4().hex
+        self._connection = self._connect(_SQLITE_CLAIM_TIMEOUT)
+        self._writer = self._connect(_SQLITE_BUSY_TIMEOUT)
+        self._writer_lock = threading.Lock()
+
+        with self._writer_lock, self._transaction(self._writer):
+            for statement in _SCHEMA:
+                self._writer.execute(statement)
+
+        self.cleanup_leases()
+
+        self._pending = collections.deque()
+        self._pending_sources = collections.Counter()
+        self._pending_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._closed = False
+        self._flusher = threading.Thread(target=self._flush_loop, name="wtelethon-shared-state", daemon=True)
+        self._flusher.start()
+
+        # фоновый поток не переживает выход интерпретатора - дописываем очередь при выходе
+        atexit.register(self.flush)
+
+    def _connect(self, timeout: float) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path, timeout=timeout, isolation_level=None, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    def close(self) -> None:
+        """Записывает отложенные изменения, снимает аренды этого процесса и закрывает соединения."""
+        atexit.unregister(self.flush)
+        self._closed = True
+        self._wakeup.set()
+        self._flusher.join()
+
+        with contextlib.suppress(sqlite3.Error):
+            self.flush()
+            with self._writer_lock, self._transaction(self._writer):
+                self._writer.execute("DELETE FROM proxy_shared_leases WHERE owner = ?", (self.owner,))
+
+        self._connection.close()
+        self._writer.close()
+
+    @contextlib.contextmanager
+    def _transaction(self, connection: sqlite3.Connection) -> Iterator[sqlite3.Connection]:
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield connection
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+
+        connection.execute("COMMIT")
+
+    @staticmethod
+    def _next_version(connection: sqlite3.Connection) -> int:
+        (version,) = connection.execute("SELECT COALESCE(MAX(version), 0) + 1 FROM proxy_shared").fetchone()
+        return version
+
+    def cleanup_leases(self) -> int:
+        """Удаляет аренды завершившихся процессов.
+
+        Returns:
+            Количество удалённых записей.
+        """
+        owners = self._connection.execute("SELECT DISTINCT owner, pid FROM proxy_shared_leases").fetchall()
+        dead = [(owner,) for owner, pid in owners if owner != self.owner and not _pid_alive(pid)]
+        if dead:
+            with self._writer_lock, self._transaction(self._writer):
+                self._writer.executemany("DELETE FROM proxy_shared_leases WHERE owner = ?", dead)
+
+        return len(dead)
+
+    def has_pending(self, source: str) -> bool:
+        """True, если у прокси есть ещё не записанные события автомата отключения."""
+        return source in self._pending_sources
+
+    def flush(self) -> int:
+        """Записывает накопленные события одной транзакцией в вызывающем потоке.
+
+        Returns:
+            Количество записанных событий.
+
+        Raises:
+            sqlite3.Error: Если запись не удалась; события остаются в очереди.
+        """
+        with self._writer_lock:
+            with self._pending_lock:
+                batch = list(self._pending)
+                self._pending.clear()
+
+            if not batch:
+                return 0
+
+            try:
+                with self._transaction(self._writer):
+                    for item in batch:
+                        self._write(item)
+            except BaseException:
+                with self._pending_lock:
+                    self._pending.extendleft(reversed(batch))
+                raise
+
+            with self._pending_lock:
+                for item in batch:
+                    if item[0] == "breaker":
+                        self._pending_sources[item[1]] -= 1
+                        if self._pending_sources[item[1]] <= 0:
+                            del self._pending_sources[item[1]]
+
+        return len(batch)
+
+    def _defer(self, item: tuple) -> None:
+        with self._pending_lock:
+            self._pending.append(item)
+            if item[0] == "breaker":
+                self._pending_sources[item[1]] += 1
+
+        self._wakeup.set()
+
+    def _flush_loop(self) -> None:
+        while not self._closed:
+            self._wakeup.wait()
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except sqlite3.Error:
+                # файл долго занят другим процессом - повторим пачку позже
+                time.sleep(_FLUSH_RETRY_DELAY)
+                self._wakeup.set()
+
+    def _write(self, item: tuple) -> None:
+        name, source, *args = item
+        if name == "breaker":
+            event, config = args
+            if (loaded := self._load_breaker(self._writer, source, config)) is None:
+                return
+
+            last_used, breaker = loaded
+            event_name, *event_args = event
+            if event_name == "failure":
+                breaker.record_failure(*event_args)
+            elif event_name == "trip":
+                breaker.trip(*event_args)
+            elif event_name == "success":
+                breaker.record_success()
+
+            self._store(self._writer, source, last_used, breaker)
+
+        elif name == "touch":
+            (now,) = args
+            self._writer.execute(
+                "UPDATE proxy_shared SET last_used = MAX(last_used, ?), version = ? WHERE source = ?",
+                (now, self._next_version(self._writer), source),
+            )
+
+        elif name == "release":
+            self._writer.execute(
+                "UPDATE proxy_shared_leases SET count = count - 1 WHERE source = ? AND owner = ?",
+                (source, self.owner),
+            )
+            self._writer.execute(
+                "DELETE FROM proxy_shared_leases WHERE source = ? AND owner = ? AND count <= 0",
+                (source, self.owner),
+            )
+
+    def register(self, states: Iterable[tuple[str, float, dict[str, Any]]]) -> dict[str, tuple[float, dict[str, Any]]]:
+        """Добавляет прокси в общее состояние, не затирая уже известные.
+
+        Args:
+            states: Кортежи (source, last_used, breaker_state).
+
+        Returns:
+            Текущее общее состояние этих прокси: {source: (last_used, breaker_state)}.
+        """
+        states = list(states)
+        with self._writer_lock, self._transaction(self._writer):
+            version = self._next_version(self._writer)
+            self._writer.executemany(
+                "INSERT OR IGNORE INTO proxy_shared (source, last_used, breaker, version) VALUES (?, ?, ?, ?)",
+                ((source, last_used, _dumps(breaker), version) for source, last_used, breaker in states),
+            )
+
+        current = {}
+        for offset in range(0, len(states), _SQLITE_MAX_PARAMS):
+            sources = [source for source, _, _ in states[offset : offset + _SQLITE_MAX_PARAMS]]
+            rows = self._connection.execute(
+                "SELECT source, last_used, breaker FROM proxy_shared WHERE source IN ({})".format(
+                    ",".join("?" * len(sources))
+                ),
+                sources,
+            )
+            for source, last_used, breaker in rows:
+                current[source] = (last_used, json.loads(breaker))
+
+        return current
+
+    def pull(self, since: int) -> tuple[int, list[tuple[str, float, dict[str, Any]]]]:
+        """Возвращает прокси, изменённые после версии `since`.
+
+        Returns:
+            Кортеж (последняя версия, [(source, last_used, breaker_state), ...]).
+        """
+        rows = self._connection.execute(
+            "SELECT source, last_used, breaker, version FROM proxy_shared WHERE version > ? ORDER BY version",
+            (since,),
+        ).fetchall()
+        if not rows:
+            return since, []
+
+        return rows[-1][3], [(source, last_used, json.loads(breaker)) for source, last_used, breaker, _ in rows]
+
+    @staticmethod
+    def _load_breaker(
+        connection: sqlite3.Connection, source: str, config: CircuitBreakerConfig
+    ) -> Optional[tuple[float, CircuitBreaker]]:
+        row = connection.execute(
+            "SELECT last_used, breaker FROM proxy_shared WHERE source = ?", (source,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        breaker = CircuitBreaker(config)
+        breaker.restore_state(json.loads(row[1]))
+        return row[0], breaker
+
+    def _store(self, connection: sqlite3.Connection, source: str, last_used: float, breaker: CircuitBreaker) -> None:
+        connection.execute(
+            "UPDATE proxy_shared SET last_used = ?, breaker = ?, version = ? WHERE source = ?",
+            (last_used, _dumps(breaker.export_state()), self._next_version(connection), source),
+        )
+
+    def claim(
+        self,
+        source: str,
+        seen_last_used: float,
+        now: float,
+        config: CircuitBreakerConfig,
+    ) -> tuple[bool, float, dict[str, Any]]:
+        """Атомарно занимает прокси, если его не занял другой процесс.
+
+        Прокси занят другим процессом, если его время использования новее
+        увиденного `seen_last_used` или автомат отключения его не выдаёт
+        (например, пробное подключение в полуоткрытом состоянии уже идёт).
+
+        Если файл дольше `_SQLITE_CLAIM_TIMEOUT` секунд занят другим процессом,
+        прокси считается занятым этим процессом без проверки, а время
+        использования записывается в общее состояние фоновым потоком.
+
+        Returns:
+            Кортеж (занят ли прокси, last_used, breaker_state) с актуальным общим состоянием.
+        """
+        try:
+            with self._transaction(self._connection):
+                if (loaded := self._load_breaker(self._connection, source, config)) is None:
+                    return True, now, {}
+
+                last_used, breaker = loaded
+                if last_used > seen_last_used or breaker.available_at(now) > now:
+                    return False, last_used, breaker.export_state()
+
+                breaker.on_acquire(now)
+                self._store(self._connection, source, now, breaker)
+
+        except sqlite3.OperationalError:
+            # выдачу прокси не задерживаем: занятость по времени использования - лишь подсказка
+            self._defer(("touch", source, now))
+            return True, now, {}
+
+        return True, now, breaker.export_state()
+
+    def queue_breaker_event(self, source: str, event: tuple, config: CircuitBreakerConfig) -> None:
+        """Ставит событие автомата отключения в очередь записи в общее состояние.
+
+        Фоновый поток применяет событие к общему состоянию автомата, не затирая
+        ошибки других процессов; итог попадает в процессы со следующим `pull`.
+
+        Args:
+            source: Ключ прокси.
+            event: ("failure", now), ("trip", now, min_timeout) или ("success",).
+            config: Пороги автомата отключения.
+
+        Raises:
+            ValueError: Если событие неизвестно.
+        """
+        if event[0] not in ("failure", "trip", "success"):
+            raise ValueError("Unknown breaker event: {}".format(event[0]))
+
+        self._defer(("breaker", source, event, config))
+
+    def acquire_lease(self, source: str, max_per_proxy: int) -> bool:
+        """Атомарно занимает аренду прокси, если у всех процессов вместе меньше `max_per_proxy` аренд.
+
+        Returns:
+            False, если лимит занят или файл дольше `_SQLITE_CLAIM_TIMEOUT` секунд
+            занят другим процессом.
+        """
+        try:
+            with self._transaction(self._connection):
+                (leases,) = self._connection.execute(
+                    "SELECT COALESCE(SUM(count), 0) FROM proxy_shared_leases WHERE source = ?", (source,)
+                ).fetchone()
+                if leases >= max_per_proxy:
+                    return False
+
+                self._connection.execute(
+                    "INSERT INTO proxy_shared_leases (source, owner, pid, count) VALUES (?, ?, ?, 1) "
+                    "ON CONFLICT (source, owner) DO UPDATE SET count = count + 1",
+                    (source, self.owner, os.getpid()),
+                )
+
+        except sqlite3.OperationalError:
+            return False
+
+        return True
+
+    def release_lease(self, source: str) -> None:
+        """Ставит снятие одной аренды прокси этого процесса в очередь записи.
+
+        До записи аренда ещё учитывается в лимите других процессов - лимит не может быть превышен.
+        """
+        self._defer(("release", source))
+
+    def leases(self, source: str) -> int:
+        """Возвращает число аренд прокси во всех процессах."""
+        (leases,) = self._connection.execute(
+            "SELECT COALESCE(SUM(count), 0) FROM proxy_shared_leases WHERE source = ?", (source,)
+        ).fetchone()
+        return leases
@@ -0,0 +1,58 @@
+from typing import Any
+
+
+class TrafficQuota:
+    """Квота трафика прокси на окно времени.
+
+    Окна выровнены по эпохе Unix (при `window=86400` - сутки UTC), что
+    совпадает с тем, как провайдеры обычно считают трафик. Прокси перестаёт
+    выдаваться, когда в текущем окне израсходовано `limit * (1 - headroom)`
+    байт, и возвращается в выдачу с началом следующего окна. Запас
+    `headroom` оставлен под трафик клиентов, уже работающих через прокси.
+    """
+
+    __slots__ = ("limit", "window", "headroom", "window_start", "used")
+
+    limit: int
+    window: float
+    headroom: float
+    window_start: float
+    used: int
+
+    def __init__(self, limit: int, window: float = 24 * 60 * 60, headroom: float = 0.1):
+        if limit <= 0 or window <= 0:
+            raise ValueError("limit and window must be greater than 0")
+
+        if not 0 <= headroom < 1:
+            raise ValueError("headroom must be in [0, 1)")
+
+        self.limit = limit
+        self.window = window
+        self.headroom = headroom
+        self.window_start = 0.0
+        self.used = 0
+
+    def _roll(self, now: float) -> None:
+        if now >= self.window_start + self.window:
+            self.window_start = now - now % self.window
+            self.used = 0
+
+    def add(self, size: int, now: float) -> None:
+        """Учитывает `size` байт трафика."""
+        self._roll(now)
+        self.used += size
+
+    def available_at(self, now: float) -> float:
+        """Возвращает момент, с которого прокси можно выдавать (0 - можно сейчас)."""
+        window_end = self.window_start + self.window
+        if now >= window_end or self.used < self.limit * (1 - self.headroom):
+            return 0
+
+        return window_end
+
+    def export_state(self) -> dict[str, Any]:
+        return {"window_start": self.window_start, "used": self.used}
+
+    def restore_state(self, state: dict[str, Any]) -> None:
+        self.window_start = state.get("window_start", self.window_start)
+        self.used = state.get("used", self.used)
@@ -0,0 +1,298 @@
+import asyncio
+import collections
+import contextlib
+import itertools
+import socket
+import time
+from typing import TYPE_CHECKING, Iterable, Optional
+
+from python_socks.async_.asyncio import Proxy as AsyncProxy
+from telethon.network.connection.connection import Connection
+
+from wtelethon.lib.metaclasses.singleton import _SingletonMeta
+from wtelethon.lib.structures import IndexedHeap
+
+
+if TYPE_CHECKING:
+    from wtelethon.storages.proxies import Proxy, ProxyStorage
+
+
+_TunnelKey = tuple[tuple, str, int]
+
+
+def _is_alive(sock: socket.socket) -> bool:
+    """Проверяет, что туннель не закрыт удалённой стороной и в нём нет лишних данных."""
+    try:
+        sock.recv(1, socket.MSG_PEEK)
+    except BlockingIOError:
+        return True
+    except OSError:
+        return False
+
+    # пустой ответ - соединение закрыто, данные до первого запроса - туннель непригоден
+    return False
+
+
+class TunnelPool(metaclass=_SingletonMeta):
+    """Пул заранее открытых туннелей через прокси до DC Telegram (singleton).
+
+    Туннель - TCP-сокет, для которого уже выполнено SOCKS5/HTTP CONNECT
+    рукопожатие с прокси до адреса DC. Подключение клиента забирает готовый
+    туннель и экономит один-два RTT до прокси, а пул в фоне открывает замену.
+    Туннели открываются только для прокси, которые хранилище может выдать
+    прямо сейчас: прокси на блокировке или с занятым лимитом аренд не греются.
+
+    Туннели, которые никто не забрал за `max_idle` секунд, закрывает фоновая
+    задача: пары (прокси, DC) лежат в min-куче по времени открытия самого
+    старого туннеля, и задача спит до ближайшего истечения.
+
+    По умолчанию пул выключен, включается через `configure`.
+    """
+
+    _storage: "ProxyStorage"
+    _size: int
+    _max_idle: float
+    _timeout: float
+    _tunnels: dict[_TunnelKey, collections.deque[tuple[float, socket.socket]]]
+    _opening: collections.Counter
+    _tasks: set[asyncio.Task]
+    _expiry: IndexedHeap[_TunnelKey]
+    _sweeper: Optional[asyncio.Task]
+    _wakeup: Optional[asyncio.Future]
+
+    def __init__(self, storage: "ProxyStorage"):
+        self._storage = storage
+        self._size = 0
+        self._max_idle = 20.0
+        self._timeout = 10.0
+        self._tunnels = {}
+        self._opening = collections.Counter()
+        self._tasks = set()
+        self._expiry = IndexedHeap()
+        self._sweeper = None
+        self._wakeup = None
+
+    @property
+    def enabled(self) -> bool:
+        return self._size > 0
+
+    def configure(self, size: int = 2, max_idle: float = 20.0, timeout: float = 10.0):
+        """Включает пул или меняет его параметры.
+
+        Args:
+            size: Сколько готовых туннелей держать на пару (прокси, DC). 0 выключает пул.
+            max_idle: Сколько секунд туннель может ждать клиента, прежде чем будет закрыт.
+            timeout: Таймаут открытия туннеля в секундах.
+
+        Example:
+            >>> tunnel_pool.configure(size=2, max_idle=15)
+        """
+        if size < 0:
+            raise ValueError("size must not be negative")
+
+        self._size = size
+        self._max_idle = max_idle
+        self._timeout = timeout
+        if not size:
+            self.clear()
+
+        # срок жизни мог сократиться - фоновая задача пересчитает время сна
+        self._wake_sweeper()
+
+    def take(self, proxy_format: tuple, host: str, port: int) -> Optional[socket.socket]:
+        """Забирает готовый туннель или возвращает None, если его нет.
+
+        Args:
+            proxy_format: Прокси в формате `Proxy.client_format()`.
+            host: Адрес DC.
+            port: Порт DC.
+        """
+        key = (proxy_format, host, port)
+        if (tunnels := self._tunnels.get(key)) is None:
+            return None
+
+        now = time.monotonic()
+        found = None
+        while tunnels and found is None:
+            created, sock = tunnels.popleft()
+            if now - created <= self._max_idle and _is_alive(sock):
+                found = sock
+            else:
+                sock.close()
+
+        self._reschedule(key, tunnels)
+        return found
+
+    def refill(self, proxy_format: tuple, host: str, port: int) -> int:
+        """Запускает в фоне открытие недостающих туннелей.
+
+        Returns:
+            Количество запущенных открытий.
+        """
+        key = (proxy_format, host, port)
+        missing = self._missing(key)
+        for _ in range(missing):
+            self._start_open(key)
+
+        return missing
+
+    async def prewarm(
+        self,
+        proxies: Optional[Iterable["Proxy"]] = None,
+        dc_ids: Optional[Iterable[int]] = None,
+        port: int = 443,
+        concurrency: int = 64,
+    ) -> int:
+        """Открывает туннели заранее, например перед массовым подключением клиентов.
+
+        Одновременно открывается не больше `concurrency` туннелей, поэтому прогрев
+        большого списка прокси не упирается в лимит файловых дескрипторов и не
+        создаёт всплеск подключений к прокси.
+
+        Args:
+            proxies: Прокси для прогрева. По умолчанию все прокси хранилища.
+            dc_ids: DC из `models.TGDC`. По умолчанию все.
+            port: Порт DC.
+            concurrency: Максимум одновременно открываемых туннелей.
+
+        Returns:
+            Количество готовых туннелей в пуле.
+
+        Raises:
+            ValueError: Если concurrency меньше 1.
+
+        Example:
+            >>> tunnel_pool.configure(size=1)
+            >>> await tunnel_pool.prewarm(dc_ids=[2, 4], concurrency=32)
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+
+        if not self.enabled:
+            return 0
+
+        # models импортирует пакет wtelethon целиком, а пул создаётся ещё при установке патчей
+        from wtelethon.lib.models import TGDC
+
+        proxies = self._storage.get_proxies() if proxies is None else list(proxies)
+        hosts = [host for dc_id in (TGDC if dc_ids is None else dc_ids) for host in TGDC[dc_id]]
+
+        # недостающие туннели считаются лениво - по мере освобождения мест в окне
+        keys = ((proxy.client_format(), host, port) for proxy in proxies for host in hosts)
+        openings = itertools.chain.from_iterable(itertools.repeat(key, self._missing(key)) for key in keys)
+        pending: set[asyncio.Task] = set()
+
+        while True:
+            for key in itertools.islice(openings, concurrency - len(pending)):
+                pending.add(self._start_open(key))
+
+            if not pending:
+                break
+
+            _, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+
+        return sum(len(tunnels) for tunnels in self._tunnels.values())
+
+    def sweep_idle(self, now: Optional[float] = None) -> int:
+        """Закрывает туннели, которые ждут клиента дольше `max_idle` секунд.
+
+        Вызывается фоновой задачей пула; ручной вызов нужен только для немедленной очистки.
+
+        Args:
+            now: Момент по `time.monotonic()`. По умолчанию текущий.
+
+        Returns:
+            Количество закрытых туннелей.
+        """
+        now = time.monotonic() if now is None else now
+        closed = 0
+
+        while (earliest := self._expiry.peek()) is not None and earliest[0] + self._max_idle < now:
+            key = earliest[1]
+            tunnels = self._tunnels[key]
+            while tunnels and tunnels[0][0] + self._max_idle < now:
+                _, sock = tunnels.popleft()
+                sock.close()
+                closed += 1
+
+            self._reschedule(key, tunnels)
+
+        return closed
+
+    def clear(self):
+        """Закрывает все готовые туннели."""
+        for tunnels in self._tunnels.values():
+            for _, sock in tunnels:
+                sock.close()
+
+        self._tunnels.clear()
+        self._expiry.clear()
+        self._wake_sweeper()
+
+    def _missing(self, key: _TunnelKey) -> int:
+        missing = self._size - len(self._tunnels.get(key, ())) - self._opening[key]
+        if missing <= 0 or not self._should_warm(key[0]):
+            return 0
+
+        return missing
+
+    def _start_open(self, key: _TunnelKey) -> asyncio.Task:
+        self._opening[key] += 1
+        task = asyncio.get_running_loop().create_task(self._open(key))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    def _reschedule(self, key: _TunnelKey, tunnels: collections.deque) -> None:
+        # туннели пары лежат в порядке открытия - срок пары задаёт самый старый
+        if tunnels:
+            self._expiry.push(key, tunnels[0][0])
+        else:
+            del self._tunnels[key]
+            self._expiry.remove(key)
+
+    def _wake_sweeper(self) -> None:
+        if self._wakeup is not None and not self._wakeup.done():
+            self._wakeup.set_result(None)
+
+    async def _sweep(self) -> None:
+        loop = asyncio.get_running_loop()
+        while (earliest := self._expiry.peek()) is not None:
+            self._wakeup = loop.create_future()
+            await asyncio.wait((self._wakeup,), timeout=max(earliest[0] + self._max_idle - time.monotonic(), 0))
+            self._wakeup = None
+            self.sweep_idle()
+
+    def _should_warm(self, proxy_format: tuple) -> bool:
+        proxy = self._storage.find_client_proxy(proxy_format)
+        return proxy is None or self._storage.is_available(proxy)
+
+    async def _open(self, key: _TunnelKey) -> None:
+        proxy_format, host, port = key
+        try:
+            connector = AsyncProxy.create(*Connection._parse_proxy(*proxy_format))
+            sock = await connector.connect(dest_host=host, dest_port=port, timeout=self._timeout)
+        except Exception:
+            return
+        finally:
+            self._opening[key] -= 1
+            if self._opening[key] <= 0:
+                del self._opening[key]
+
+        tunnels = self._tunnels.get(key)
+        if not self.enabled or len(tunnels or ()) >= self._size or not self._should_warm(proxy_format):
+            with contextlib.suppress(OSError):
+                sock.close()
+            return
+
+        # очередь создаётся только под реально сохраняемый сокет
+        if tunnels is None:
+            tunnels = self._tunnels[key] = collections.deque()
+
+        sock.setblocking(False)
+        tunnels.append((time.monotonic(), sock))
+        if len(tunnels) == 1:
+            self._expiry.push(key, tunnels[0][0])
+
+        if self._sweeper is None or self._sweeper.done():
+            self._sweeper = asyncio.get_running_loop().create_task(self._sweep())
@@ -1,8 +1,11 @@
+import asyncio
 import inspect
 from typing import TYPE_CHECKING
 
 from telethon.client import UserMethods
+from telethon.tl.tlobject import TLRequest
 from wtelethon import utils
+from wtelethon.storages import connection_budget, rate_limit_storage
 
 if TYPE_CHECKING:
     from wtelethon import TelegramClient
@@ -16,15 +19,40 @@ class InternalTools:
         ordered=False,
         flood_sleep_threshold=None,
     ) -> "TelegramClient":
+        if isinstance(request, TLRequest):
+            delay = rate_limit_storage.reserve(self, request)
+        elif isinstance(request, (list, tuple)):
+            delay = max((rate_limit_storage.reserve(self, r) for r in request), default=0)
+        else:
+            delay = 0
+
+        if delay:
+            await asyncio.sleep(delay)
+
+        tracked = connection_budget.enabled
+        if tracked:
+            await connection_budget.begin_call(self)
+
         try:
             self.memory.dead_status = False
-            return await UserMethods._call(
+            result = await UserMethods._call(
                 self, sender, request, ordered, flood_sleep_threshold
             )
+            if self._rate_learning is not None:
+                self._on_rate_success(request)
+
+            return result
 
         except Exception as exc:
             if utils.is_dead_error(exc):
                 self.memory.dead_status = True
                 self.memory.dead_error = exc
 
+            elif self._flood_hold_scope is not None and utils.is_flood_wait_error(exc):
+                self._add_flood_hold(request, exc)
+
             return await self.handle_exception(request, exc)
+
+        finally:
+            if tracked:
+                connection_budget.end_call(self)
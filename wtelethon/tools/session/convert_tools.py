@@ -79,19 +79,30 @@ class ConvertTools:
             filename=filename,
         )
 
+    @staticmethod
+    def _sync_read_sqlite_session(session_path: str) -> StringSession:
+        """Читает DC и ключ авторизации из .session файла в StringSession."""
+        if not os.path.exists(session_path):
+            raise ValueError("session file not found")
+
+        sqlite_session = SQLiteSession(session_path)
+        try:
+            session = StringSession()
+            session.set_dc(sqlite_session.dc_id, utils.get_dc_address(sqlite_session.dc_id), 443)
+            session.auth_key = sqlite_session.auth_key
+        finally:
+            sqlite_session.close()
+
+        return session
+
     def _sync_load_sqlite_session(
         self: "TelegramClient",
     ) -> StringSession:
-        session_path = os.path.join(self.memory.source_dir, self.memory.session_file)
-
-        if not self.memory.session_file or not os.path.exists(session_path):
+        if not self.memory.session_file:
             raise ValueError("session file not found")
 
-        sqlite_session = SQLiteSession(session_path)
-
-        self.session = StringSession()
-        self.set_dc(sqlite_session.dc_id)
-        self.set_auth_key(sqlite_session.auth_key)
+        session_path = os.path.join(self.memory.source_dir, self.memory.session_file)
+        self.session = self._sync_read_sqlite_session(session_path)
 
         return self.session
 
@@ -0,0 +1,156 @@
+import asyncio
+import itertools
+import os
+from typing import TYPE_CHECKING, AsyncIterator, Callable, Optional, Union
+
+from telethon.sessions import StringSession
+
+from wtelethon import helpers, utils
+from wtelethon.attachments import JsonAttachment, MemoryAttachment
+
+if TYPE_CHECKING:
+    from wtelethon import TelegramClient
+    from wtelethon.lib.helpers.files import SessionItem
+
+
+LoadErrorHandler = Callable[["SessionItem", Exception], None]
+
+
+class LoaderTools:
+    """Инструменты для создания клиентов без блокирующего чтения файлов в event loop."""
+
+    @classmethod
+    def _sync_read_client_files(
+        cls, session, json_path: Optional[str]
+    ) -> tuple[object, Optional[JsonAttachment], Optional[MemoryAttachment]]:
+        json_attachment = None
+        if json_path:
+            json_attachment = JsonAttachment(json_path)
+            json_attachment._sync_load()
+
+        # строковые сессии и hex-ключи разбираются в памяти, с диска читается только .session
+        if not isinstance(session, str) or (session[0] == "1" and len(session) == 353):
+            return session, json_attachment, None
+
+        if utils.is_hex(session) and len(session) == 512:
+            return session, json_attachment, None
+
+        files_memory = MemoryAttachment(
+            source_dir=os.path.dirname(session),
+            session_file=os.path.basename(session),
+        )
+        return cls._sync_read_sqlite_session(session), json_attachment, files_memory
+
+    @classmethod
+    async def create(
+        cls,
+        session: Union[str, StringSession],
+        *,
+        json_path: Optional[str] = None,
+        memory_attachment: Optional[MemoryAttachment] = None,
+        **kwargs,
+    ) -> "TelegramClient":
+        """Создаёт клиента, читая файлы в пуле потоков.
+
+        В отличие от конструктора, .session и JSON читаются вне event loop,
+        а клиент инициализируется один раз: с `json_path` не нужно отдельно
+        вызывать `load_json_info`. Массовое создание клиентов не задерживает
+        запросы уже работающих клиентов.
+
+        Args:
+            session: Путь к .session файлу, строковая сессия, hex-ключ или объект сессии.
+            json_path: Путь к JSON файлу аккаунта. Файл должен существовать.
+            memory_attachment: Значения памяти поверх данных из JSON.
+            **kwargs: Остальные параметры конструктора клиента.
+
+        Returns:
+            Готовый к подключению клиент.
+
+        Raises:
+            ValueError: Если файл сессии или JSON не найден, или вместе с
+                `json_path` передан `json_attachment`.
+
+        Example:
+            >>> client = await TelegramClient.create("./accounts/79991234567.session", json_path="./accounts/79991234567.json")
+            >>> await client.connect()
+        """
+        if json_path and kwargs.get("json_attachment") is not None:
+            raise ValueError("json_path and json_attachment are mutually exclusive")
+
+        session, json_attachment, files_memory = await asyncio.to_thread(cls._sync_read_client_files, session, json_path)
+        if json_attachment is not None:
+            kwargs["json_attachment"] = json_attachment
+
+        if files_memory is not None and memory_attachment is not None:
+            merged = MemoryAttachment()
+            merged += memory_attachment
+            merged += files_memory
+            files_memory = merged
+
+        return cls(session, memory_attachment=files_memory or memory_attachment, **kwargs)
+
+    @classmethod
+    async def load_many(
+        cls,
+        path: str,
+        concurrency: int = 16,
+        on_error: Optional[LoadErrorHandler] = None,
+        **kwargs,
+    ) -> AsyncIterator["TelegramClient"]:
+        """Загружает пары .session + .json из директории и отдаёт клиентов по мере готовности.
+
+        Поиск файлов, разбор JSON и чтение SQLite-сессий идут в пуле потоков,
+        одновременно читается не больше `concurrency` аккаунтов. Следующие
+        аккаунты читаются только по мере того, как потребитель забирает готовых
+        клиентов, поэтому первые клиенты можно подключать, пока остальные ещё
+        не прочитаны. Клиенты отдаются в порядке готовности, а не в порядке файлов.
+
+        Args:
+            path: Директория для поиска (рекурсивно, как `helpers.files.glob_files`).
+            concurrency: Максимум одновременно читаемых аккаунтов.
+            on_error: Вызывается с (SessionItem, исключение) для аккаунта, который не
+                удалось загрузить; такой аккаунт пропускается. Без обработчика
+                исключение пробрасывается из генератора.
+            **kwargs: Параметры конструктора клиента (timeout, connection_retries и т.д.).
+
+        Yields:
+            Готовый к подключению клиент с загруженным JSON и сессией в памяти.
+
+        Raises:
+            ValueError: Если concurrency меньше 1.
+
+        Example:
+            >>> async for client in TelegramClient.load_many("./accounts", concurrency=32):
+            >>>     asyncio.create_task(process_client(client))
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+
+        files = await asyncio.to_thread(helpers.files.glob_files, path)
+        items = iter(files.values())
+        pending: dict[asyncio.Task, "SessionItem"] = {}
+
+        try:
+            while True:
+                for item in itertools.islice(items, concurrency - len(pending)):
+                    pending[asyncio.create_task(cls.create(item.session, json_path=item.json, **kwargs))] = item
+
+                if not pending:
+                    return
+
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    item = pending.pop(task)
+                    try:
+                        client = task.result()
+                    except Exception as exc:
+                        if on_error is None:
+                            raise
+
+                        on_error(item, exc)
+                        continue
+
+                    yield client
+        finally:
+            for task in pending:
+                task.cancel()
@@ -1,4 +1,5 @@
 from .proxies_tools import ProxyStorageTools
 from .client_hold_tools import ClientHoldStorageTools
+from .rate_limit_tools import RateLimitStorageTools
 
-__ALL__ = [ProxyStorageTools, ClientHoldStorageTools]
+__ALL__ = [ProxyStorageTools, ClientHoldStorageTools, RateLimitStorageTools]
@@ -1,4 +1,6 @@
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Literal, Optional
+
+from telethon.tl.tlobject import TLRequest
 
 from wtelethon.storages import client_holds_storage
 
@@ -9,6 +11,41 @@ if TYPE_CHECKING:
 class ClientHoldStorageTools:
     """Инструменты для управления временными блокировками клиентов."""
 
+    _flood_hold_scope: Optional[Literal["account", "method"]] = None
+
+    def enable_flood_holds(self: "TelegramClient", per_method: bool = False):
+        """Включает автоматическую блокировку клиента в хранилище при FloodWait.
+
+        FloodWait длиннее `flood_sleep_threshold` клиента превращается в блокировку
+        на `seconds` из ошибки, после чего ошибка передаётся обработчикам как обычно.
+        Планировщик на `client_holds_storage.wait_free_client` тем временем выдаёт
+        другие аккаунты. Короткие FloodWait клиент по-прежнему пережидает сам.
+
+        Args:
+            per_method: Если True, блокируется только метод TL, получивший FloodWait
+                (см. `wait_free_client(method=...)`), иначе весь аккаунт.
+
+        Example:
+            >>> client.flood_sleep_threshold = 10
+            >>> client.enable_flood_holds(per_method=True)
+        """
+        self._flood_hold_scope = "method" if per_method else "account"
+
+    def disable_flood_holds(self: "TelegramClient"):
+        """Выключает автоматическую блокировку клиента при FloodWait.
+
+        Example:
+            >>> client.disable_flood_holds()
+        """
+        self._flood_hold_scope = None
+
+    def _add_flood_hold(self: "TelegramClient", request: Optional[TLRequest], exc: Exception):
+        method = getattr(exc, "request", None) or request
+        if self._flood_hold_scope != "method" or not isinstance(method, TLRequest):
+            method = None
+
+        client_holds_storage.add_hold(self, exc.seconds, method=method)
+
     def add_storage_hold(self: "TelegramClient", add_hold: int = 60):
         """Добавляет временную блокировку для клиента.
 
@@ -1,17 +1,20 @@
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 
+from wtelethon.lib.utils import match_country_by_number
 from wtelethon.storages import proxy_storage
 
 
 if TYPE_CHECKING:
     from wtelethon import TelegramClient
     from wtelethon.storages import Proxy
+    from wtelethon.storages.proxies import ProxyLease
 
 
 class ProxyStorageTools:
     """Инструменты для работы с хранилищем прокси-серверов."""
 
     _current_proxy: "Proxy"
+    _proxy_lease: "ProxyLease"
 
     @property
     def current_proxy(self: "TelegramClient") -> "Proxy":
@@ -30,18 +33,29 @@ class ProxyStorageTools:
         self: "TelegramClient",
         random_choice: bool = False,
         usage_index_choice: bool = True,
+        weighted_choice: bool = False,
+        affinity: bool = False,
+        tags: Optional[dict[str, str]] = None,
+        match_phone_country: bool = False,
     ) -> "Proxy":
         """Устанавливает прокси из хранилища для клиента.
 
         Args:
             random_choice: Если True, выбирает прокси случайно.
             usage_index_choice: Если True, выбирает по индексу использования.
+            weighted_choice: Если True, чаще выбирает быстрые и надёжные прокси.
+            affinity: Если True, закрепляет прокси за аккаунтом по `memory.account_id`
+                или `memory.phone`, чтобы аккаунт не менял IP между подключениями.
+            tags: Выбирать только прокси с указанными метками (см. `Proxy.tags`).
+            match_phone_country: Если True, выбирает прокси с меткой `country`,
+                совпадающей со страной `memory.phone` (код ISO, например "US").
 
         Returns:
             Объект установленного прокси.
 
         Raises:
-            ValueError: Если в хранилище нет доступных прокси.
+            ValueError: Если в хранилище нет доступных прокси, для привязки
+                не задан ни account_id, ни phone или для подбора страны не задан phone.
 
         Example:
             >>> # Установить прокси по умолчанию (по индексу)
@@ -49,28 +63,128 @@ class ProxyStorageTools:
             >>>
             >>> # Установить случайный прокси
             >>> proxy = client.set_proxy_from_storage(random_choice=True)
+            >>>
+            >>> # Всегда выдавать аккаунту один и тот же прокси
+            >>> proxy = client.set_proxy_from_storage(affinity=True)
+            >>>
+            >>> # Закрепить за аккаунтом прокси из страны его номера
+            >>> proxy = client.set_proxy_from_storage(affinity=True, match_phone_country=True)
         """
         new_proxy = proxy_storage.get_proxy(
             random_choice=random_choice,
             usage_index_choice=usage_index_choice,
+            weighted_choice=weighted_choice,
+            affinity_key=self._get_proxy_affinity_key(affinity),
+            tags=self._get_proxy_tags(tags, match_phone_country),
         )
         if not new_proxy:
             raise ValueError("No available proxies found")
 
+        self.release_proxy_lease()
+        self.set_proxy(new_proxy.client_format())
+        self._current_proxy = new_proxy
+        return new_proxy
+
+    async def lease_proxy_from_storage(
+        self: "TelegramClient",
+        max_per_proxy: int = 1,
+        timeout: Optional[float] = None,
+        random_choice: bool = False,
+        usage_index_choice: bool = True,
+        weighted_choice: bool = False,
+        affinity: bool = False,
+        tags: Optional[dict[str, str]] = None,
+        match_phone_country: bool = False,
+    ) -> "Proxy":
+        """Арендует прокси из хранилища и устанавливает его для клиента.
+
+        В отличие от `set_proxy_from_storage`, ждёт освобождения прокси, если
+        все они заняты или заблокированы. Аренда снимается автоматически при
+        `disconnect()` клиента или вручную через `release_proxy_lease()`.
+
+        Args:
+            max_per_proxy: Максимум клиентов на одном прокси одновременно.
+            timeout: Максимальное время ожидания в секундах (None - без ограничения).
+            random_choice: Если True, выбирает прокси случайно.
+            usage_index_choice: Если True, выбирает по индексу использования.
+            weighted_choice: Если True, чаще выбирает быстрые и надёжные прокси.
+            affinity: Если True, закрепляет прокси за аккаунтом.
+            tags: Выбирать только прокси с указанными метками.
+            match_phone_country: Если True, выбирает прокси из страны `memory.phone`.
+
+        Returns:
+            Объект арендованного прокси.
+
+        Raises:
+            asyncio.TimeoutError: Если прокси не освободился за `timeout` секунд.
+
+        Example:
+            >>> proxy = await client.lease_proxy_from_storage(max_per_proxy=3)
+            >>> await client.connect()
+            >>> ...
+            >>> await client.disconnect()  # прокси возвращается в хранилище
+        """
+        lease = proxy_storage.lease(
+            max_per_proxy=max_per_proxy,
+            timeout=timeout,
+            random_choice=random_choice,
+            usage_index_choice=usage_index_choice,
+            weighted_choice=weighted_choice,
+            affinity_key=self._get_proxy_affinity_key(affinity),
+            tags=self._get_proxy_tags(tags, match_phone_country),
+        )
+        new_proxy = await lease.acquire()
+
+        self.release_proxy_lease()
         self.set_proxy(new_proxy.client_format())
         self._current_proxy = new_proxy
+        self._proxy_lease = lease
         return new_proxy
 
+    def release_proxy_lease(self: "TelegramClient"):
+        """Возвращает арендованный прокси в хранилище, если аренда есть.
+
+        Example:
+            >>> client.release_proxy_lease()
+        """
+        lease = getattr(self, "_proxy_lease", None)
+        if lease is not None:
+            self._proxy_lease = None
+            lease.release()
+
+    def _get_proxy_affinity_key(self: "TelegramClient", affinity: bool) -> Optional[str]:
+        if not affinity:
+            return None
+
+        affinity_key = self.memory.account_id or self.memory.phone
+        if not affinity_key:
+            raise ValueError("account_id or phone is required for proxy affinity")
+
+        return str(affinity_key)
+
+    def _get_proxy_tags(
+        self: "TelegramClient", tags: Optional[dict[str, str]], match_phone_country: bool
+    ) -> Optional[dict[str, str]]:
+        if not match_phone_country:
+            return tags
+
+        country = match_country_by_number(self.memory.phone)
+        if not country:
+            raise ValueError("phone is required to match proxy country")
+
+        return {**(tags or {}), "country": country}
+
     def proxy_error(self: "TelegramClient"):
         """Отмечает ошибку для текущего прокси.
 
         Увеличивает счетчик ошибок для текущего прокси, что влияет
-        на его приоритет при следующем выборе.
+        на его приоритет при следующем выборе. Ошибки `connect()` учитываются
+        автоматически, вручную отмечаются ошибки, замеченные позже.
 
         Example:
             >>> try:
-            >>>     await client.connect()
-            >>> except ConnectionError:
+            >>>     await asyncio.wait_for(client.get_me(), 10)
+            >>> except asyncio.TimeoutError:
             >>>     client.proxy_error()  # отметить ошибку прокси
             >>>     client.set_proxy_from_storage()  # взять другой
         """
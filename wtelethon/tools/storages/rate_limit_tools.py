@@ -0,0 +1,182 @@
+from typing import TYPE_CHECKING, Iterable, NamedTuple, Optional
+
+from telethon.tl.tlobject import TLRequest
+
+from wtelethon.lib.structures import TokenBucket
+from wtelethon.lib.utils import is_flood_wait_error
+from wtelethon.storages import rate_pacer_storage
+from wtelethon.storages.client_holds import MethodType, _method_name
+from wtelethon.storages.rate_limits import RateRule, make_rate_rule
+from wtelethon.storages.rate_pacer import MethodPace, account_age_bucket
+
+if TYPE_CHECKING:
+    from wtelethon import TelegramClient
+
+
+class RateLearningParams(NamedTuple):
+    min_rate: float
+    max_rate: float
+    increase: float
+    decrease: float
+    burst: int
+    age_bucket: str
+
+
+def _flood_rate(pace: MethodPace, params: RateLearningParams, seconds: Optional[int]) -> float:
+    """Новая частота метода после FloodWait на `seconds` секунд (запросов в минуту).
+
+    Частота умножается на `decrease` и не превышает одного запроса за время
+    ожидания: FloodWait на 10 минут опускает метод сразу до ~0.1 запроса в минуту,
+    а не на долю от прежней частоты.
+    """
+    rate = pace.rate * params.decrease
+    if seconds:
+        rate = min(rate, 60 / seconds)
+
+    return max(rate, params.min_rate)
+
+
+def _on_rate_flood(client: "TelegramClient", request: Optional[TLRequest], exc: Exception) -> None:
+    """Обработчик FloodWait: снижает частоту метода с учётом времени ожидания."""
+    method = getattr(exc, "request", None) or request
+    if client._rate_learning is None or not isinstance(method, TLRequest):
+        return
+
+    if (pace := client._rate_learning.get(type(method).__name__)) is None:
+        return
+
+    rate = _flood_rate(pace, client._rate_learning_params, getattr(exc, "seconds", None))
+    client._set_learned_rate(type(method).__name__, rate)
+
+
+class RateLimitStorageTools:
+    """Инструменты для ограничения частоты запросов клиента."""
+
+    _rate_limit_rules: Optional[dict[str, RateRule]] = None
+    _rate_limit_buckets: Optional[dict[str, TokenBucket]] = None
+    _rate_learning: Optional[dict[str, MethodPace]] = None
+    _rate_learning_params: Optional[RateLearningParams] = None
+
+    def set_rate_limit(
+        self: "TelegramClient",
+        method: MethodType,
+        limit: Optional[int],
+        per: float = 1.0,
+        burst: Optional[int] = None,
+    ):
+        """Задаёт ограничение частоты запросов метода только для этого клиента.
+
+        Заменяет правило `rate_limit_storage.set_limit` для клиента; общий лимит
+        (`fleet=True`) продолжает действовать.
+
+        Args:
+            method: Метод TL - имя класса запроса, запрос или его класс.
+            limit: Сколько запросов разрешено за `per` секунд. None снимает правило клиента.
+            per: Период в секундах.
+            burst: Сколько запросов можно сделать подряд без ожидания. По умолчанию `limit`.
+
+        Example:
+            >>> client.set_rate_limit(functions.channels.JoinChannelRequest, 1, per=30)
+        """
+        name = _method_name(method)
+        if limit is None:
+            if self._rate_limit_rules:
+                self._rate_limit_rules.pop(name, None)
+            return
+
+        rule = make_rate_rule(limit, per, burst)
+        if self._rate_limit_rules is None:
+            self._rate_limit_rules = {}
+
+        self._rate_limit_rules[name] = rule
+
+    def enable_rate_learning(
+        self: "TelegramClient",
+        methods: Iterable[MethodType],
+        initial_rate: float = 10.0,
+        min_rate: float = 0.5,
+        max_rate: float = 60.0,
+        increase: float = 1.0,
+        decrease: float = 0.5,
+        burst: int = 1,
+    ):
+        """Включает подбор безопасной частоты методов по FloodWait (AIMD).
+
+        Частота каждого метода задаёт правило `set_rate_limit` клиента.
+        Примерно каждую минуту без FloodWait (после `rate` успешных запросов)
+        частота растёт на `increase`, а каждый FloodWait умножает её на
+        `decrease` и ограничивает сверху одним запросом за время ожидания
+        (FloodWait на 120 секунд - не больше 0.5 запроса в минуту). Изученные частоты сохраняются в `memory.learned_rates`
+        (и в JSON при сохранении), а также в `rate_pacer_storage` по группе
+        возраста аккаунта.
+
+        Стартовая частота метода: из `memory.learned_rates`, иначе изученная
+        другими аккаунтами той же группы возраста, иначе `initial_rate`.
+
+        Args:
+            methods: Методы TL - имена классов запросов, запросы или их классы.
+            initial_rate: Стартовая частота в запросах в минуту.
+            min_rate: Нижняя граница частоты в запросах в минуту.
+            max_rate: Верхняя граница частоты в запросах в минуту.
+            increase: Аддитивный шаг увеличения в запросах в минуту.
+            decrease: Множитель при FloodWait (от 0 до 1).
+            burst: Сколько запросов можно сделать подряд без ожидания.
+
+        Raises:
+            ValueError: Если параметры некорректны.
+
+        Example:
+            >>> client.enable_rate_learning(
+            >>>     [functions.contacts.ResolveUsernameRequest, functions.channels.JoinChannelRequest],
+            >>>     initial_rate=5,
+            >>> )
+        """
+        if not 0 < min_rate <= max_rate or increase <= 0 or not 0 < decrease < 1:
+            raise ValueError("Invalid rate learning parameters")
+
+        self._rate_learning_params = RateLearningParams(
+            min_rate, max_rate, increase, decrease, burst, account_age_bucket(self.memory.session_created_date)
+        )
+        if self._rate_learning is None:
+            self._rate_learning = {}
+            self.add_exception_handler(is_flood_wait_error, _on_rate_flood)
+
+        learned = self.memory.learned_rates or {}
+        for method in methods:
+            name = _method_name(method)
+            rate = learned.get(name) or rate_pacer_storage.seed(name, self._rate_learning_params.age_bucket)
+            self._rate_learning[name] = MethodPace(0)
+            self._set_learned_rate(name, min(max(rate or initial_rate, min_rate), max_rate), learn=False)
+
+    def disable_rate_learning(self: "TelegramClient"):
+        """Выключает подбор частоты; изученные правила `set_rate_limit` остаются.
+
+        Example:
+            >>> client.disable_rate_learning()
+        """
+        if self._rate_learning is None:
+            return
+
+        self._rate_learning = None
+        self.remove_exception_handler(is_flood_wait_error, _on_rate_flood)
+
+    def _on_rate_success(self: "TelegramClient", request):
+        if not isinstance(request, TLRequest) or (pace := self._rate_learning.get(type(request).__name__)) is None:
+            return
+
+        pace.successes += 1
+        if pace.successes >= pace.rate:
+            params = self._rate_learning_params
+            self._set_learned_rate(type(request).__name__, min(pace.rate + params.increase, params.max_rate))
+
+    def _set_learned_rate(self: "TelegramClient", name: str, rate: float, learn: bool = True):
+        pace = self._rate_learning[name]
+        pace.rate, pace.successes = rate, 0
+        self.set_rate_limit(name, rate, per=60, burst=self._rate_learning_params.burst)
+
+        if self.memory.learned_rates is None:
+            self.memory.learned_rates = {}
+
+        self.memory.learned_rates[name] = round(rate, 3)
+        if learn:
+            rate_pacer_storage.learn(name, self._rate_learning_params.age_bucket, rate)